@@ -4,108 +4,179 @@ Detailed debugging to understand why patents aren't scoring high enough
 """
 
 from improved_drug_analyzer import ImprovedDrugDiscoveryAnalyzer
+import os
+import sys
 import json
-import glob
+from functools import lru_cache
+from itertools import islice
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Common drug-related terms for the manual sanity check, matched alongside the analyzer keywords
+DRUG_TERMS = ('drug', 'compound', 'therapeutic', 'treatment', 'medicine', 'therapy', 'pharmaceutical', 'inhibitor', 'target')
+
+@lru_cache(maxsize=1)
+def _get_analyzer() -> ImprovedDrugDiscoveryAnalyzer:
+    """Shared analyzer for all debug entry points (reset with _get_analyzer.cache_clear())"""
+    return ImprovedDrugDiscoveryAnalyzer()
+
+# Controlled examples with different levels of drug discovery content
+SCORING_TEST_CASES = tuple(MappingProxyType(case) for case in (
+    {
+        'patent_number': 'HIGH_DRUG',
+        'title': 'Pharmaceutical composition comprising small molecule drug targeting FOXP2 for therapeutic treatment of autism',
+        'abstract': 'This invention relates to pharmaceutical compositions and therapeutic methods for treating autism spectrum disorders using novel small molecule compounds that specifically inhibit FOXP2 protein activity. The drug candidates showed efficacy in preclinical studies.',
+        'raw_text': 'pharmaceutical composition small molecule drug therapeutic treatment autism inhibitor compound efficacy preclinical clinical trial'
+    },
+    {
+        'patent_number': 'MEDIUM_DRUG',
+        'title': 'FOXP2 biomarker for neurological disorder diagnosis and treatment monitoring',
+        'abstract': 'Methods for using FOXP2 expression as a biomarker for diagnosis and therapeutic monitoring of speech disorders.',
+        'raw_text': 'biomarker diagnosis therapeutic monitoring speech disorders neurological treatment'
+    },
+    {
+        'patent_number': 'LOW_DRUG',
+        'title': 'FOXP2 gene expression in developmental studies',
+        'abstract': 'Research methods for studying FOXP2 gene expression during development.',
+        'raw_text': 'gene expression developmental studies research methods laboratory'
+    }
+))
+
+# Mock patents built from real FOXP2 patent titles that might be drug-related
+REAL_FOXP2_TEST_PATENTS = tuple(MappingProxyType(patent) for patent in (
+    {
+        'patent_number': 'US11679148B2',
+        'title': 'Methods and compositions for treating cancers',
+        'abstract': 'Therapeutic compositions and methods for treating cancer using pharmaceutical compounds.',
+        'raw_text': 'methods compositions treating cancers therapeutic pharmaceutical compounds treatment'
+    },
+    {
+        'patent_number': 'AU2009329380A1', 
+        'title': 'Use of FOXP2 as a marker for abnormal lymphocytes and as a target for therapy',
+        'abstract': 'FOXP2 protein as therapeutic target and biomarker for treatment of lymphocyte disorders.',
+        'raw_text': 'FOXP2 marker therapeutic target therapy treatment lymphocytes biomarker pharmaceutical'
+    }
+))
+
+def _write_lines(lines: List[str]):
+    """Emit a block of report lines with a single stdout write"""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+def _find_latest_results(directory: str, prefix: str) -> Optional[str]:
+    """Return the path of the most recently modified prefix*.json file, or None"""
+    if not os.path.isdir(directory):
+        return None
+    
+    with os.scandir(directory) as entries:
+        latest = max(
+            (entry for entry in entries if entry.name.startswith(prefix) and entry.name.endswith('.json')),
+            key=lambda entry: entry.stat().st_mtime,
+            default=None
+        )
+    return latest.path if latest else None
+
+def _load_first_patents(path: str, limit: int) -> List[Dict[str, Any]]:
+    """Load the first `limit` patents from a results file, streaming it when ijson is installed"""
+    if IJSON_AVAILABLE:
+        with open(path, 'rb') as f:
+            return list(islice(ijson.items(f, 'item', use_float=True), limit))
+    
+    if ORJSON_AVAILABLE:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())[:limit]
+    
+    with open(path, 'r') as f:
+        return json.load(f)[:limit]
 
 def analyze_sample_patents():
     """Analyze actual patents to see scoring details"""
     
-    analyzer = ImprovedDrugDiscoveryAnalyzer()
+    analyzer = _get_analyzer()
     
     # Load recent results
-    json_files = glob.glob("patent_data/drug_discovery_analysis/improved_foxp2_drug_discovery_*.json")
-    if not json_files:
+    latest_file = _find_latest_results("patent_data/drug_discovery_analysis", "improved_foxp2_drug_discovery_")
+    if not latest_file:
         print("❌ No results found")
         return
     
-    latest_file = max(json_files)
-    with open(latest_file, 'r') as f:
-        patents = json.load(f)
+    # Analyze first 5 patents in detail
+    patents = _load_first_patents(latest_file, 5)
     
-    print(f"🔍 Analyzing {len(patents)} patents from recent run")
+    print(f"🔍 Analyzing first {len(patents)} patents from recent run")
     
-    # Analyze first 5 patents in detail
-    for i, patent in enumerate(patents[:5]):
-        print(f"\n{'='*60}")
-        print(f"📄 PATENT {i+1}: {patent['patent_number']}")
-        print(f"Title: {patent['title']}")
-        print(f"Abstract: {patent.get('abstract', 'None')[:200]}...")
+    for i, patent in enumerate(patents):
+        # One pass over the patent text yields both the analysis and the basic drug terms
+        analysis, found_drug_terms = analyzer.scan_all(patent, DRUG_TERMS)
         
-        # Show raw text sample
+        title = patent.get('title', '')
+        abstract = patent.get('abstract', '')
         raw_text = patent.get('raw_text', '')
-        print(f"Raw text sample: {raw_text[:300]}...")
         
-        # Analyze this patent step by step
-        analysis = analyzer.analyze_drug_discovery_relevance(patent)
+        lines = [f"\n{'='*60}"]
+        lines.append(f"📄 PATENT {i+1}: {patent['patent_number']}")
+        lines.append(f"Title: {title}")
+        lines.append(f"Abstract: {abstract[:200] or 'None'}...")
+        
+        # Show raw text sample
+        lines.append(f"Raw text sample: {raw_text[:300]}...")
         
-        print(f"\n🔬 ANALYSIS RESULTS:")
-        print(f"   Relevance Score: {analysis.relevance_score:.2f}")
-        print(f"   Category: {analysis.category}")
-        print(f"   Confidence: {analysis.confidence:.1f}")
-        print(f"   Key Terms Found: {analysis.key_terms}")
-        print(f"   Reasoning: {analysis.reasoning}")
+        lines.append(f"\n🔬 ANALYSIS RESULTS:")
+        lines.append(f"   Relevance Score: {analysis.relevance_score:.2f}")
+        lines.append(f"   Category: {analysis.category}")
+        lines.append(f"   Confidence: {analysis.confidence:.1f}")
+        lines.append(f"   Key Terms Found: {analysis.key_terms}")
+        lines.append(f"   Reasoning: {analysis.reasoning}")
         
         # Manual keyword checking
-        print(f"\n🔑 MANUAL KEYWORD CHECK:")
-        text_to_check = f"{patent.get('title', '')} {patent.get('abstract', '')} {patent.get('raw_text', '')}".lower()
-        
-        keyword_hits = []
-        for category, keywords in analyzer.drug_discovery_keywords.items():
-            for keyword in keywords:
-                if keyword.lower() in text_to_check:
-                    keyword_hits.append(f"{keyword} ({category})")
+        lines.append(f"\n🔑 MANUAL KEYWORD CHECK:")
+        keyword_hits = [
+            analyzer.keyword_labels[(category, keyword)]
+            for category, keywords in analysis.terms_by_category.items()
+            for keyword in keywords
+        ]
         
         if keyword_hits:
-            print(f"   Found keywords: {', '.join(keyword_hits[:10])}")
+            lines.append(f"   Found keywords: {', '.join(keyword_hits[:10])}")
         else:
-            print(f"   No keywords found in text")
-            
-        # Check for common drug-related terms manually
-        drug_terms = ['drug', 'compound', 'therapeutic', 'treatment', 'medicine', 'therapy', 'pharmaceutical', 'inhibitor', 'target']
-        found_drug_terms = [term for term in drug_terms if term in text_to_check]
+            lines.append(f"   No keywords found in text")
+        
+        # Common drug-related terms found during the same scan
         if found_drug_terms:
-            print(f"   Basic drug terms found: {found_drug_terms}")
+            lines.append(f"   Basic drug terms found: {found_drug_terms}")
+        
+        _write_lines(lines)
 
 def test_scoring_mechanism():
     """Test the scoring mechanism with controlled examples"""
     
-    analyzer = ImprovedDrugDiscoveryAnalyzer()
-    
-    # Test patents with different levels of drug discovery content
-    test_cases = [
-        {
-            'patent_number': 'HIGH_DRUG',
-            'title': 'Pharmaceutical composition comprising small molecule drug targeting FOXP2 for therapeutic treatment of autism',
-            'abstract': 'This invention relates to pharmaceutical compositions and therapeutic methods for treating autism spectrum disorders using novel small molecule compounds that specifically inhibit FOXP2 protein activity. The drug candidates showed efficacy in preclinical studies.',
-            'raw_text': 'pharmaceutical composition small molecule drug therapeutic treatment autism inhibitor compound efficacy preclinical clinical trial'
-        },
-        {
-            'patent_number': 'MEDIUM_DRUG',
-            'title': 'FOXP2 biomarker for neurological disorder diagnosis and treatment monitoring',
-            'abstract': 'Methods for using FOXP2 expression as a biomarker for diagnosis and therapeutic monitoring of speech disorders.',
-            'raw_text': 'biomarker diagnosis therapeutic monitoring speech disorders neurological treatment'
-        },
-        {
-            'patent_number': 'LOW_DRUG',
-            'title': 'FOXP2 gene expression in developmental studies',
-            'abstract': 'Research methods for studying FOXP2 gene expression during development.',
-            'raw_text': 'gene expression developmental studies research methods laboratory'
-        }
-    ]
+    analyzer = _get_analyzer()
     
     print(f"\n🧪 TESTING SCORING MECHANISM:")
     print("=" * 50)
     
-    for test_case in test_cases:
-        print(f"\n📄 {test_case['patent_number']}")
-        print(f"Title: {test_case['title']}")
-        
-        analysis = analyzer.analyze_drug_discovery_relevance(test_case)
-        
-        print(f"Score: {analysis.relevance_score:.2f}")
-        print(f"Category: {analysis.category}")
-        print(f"Key Terms: {analysis.key_terms}")
-        print(f"Reasoning: {analysis.reasoning}")
+    analyses = analyzer.score_batch(SCORING_TEST_CASES)
+    
+    for test_case, analysis in zip(SCORING_TEST_CASES, analyses):
+        _write_lines([
+            f"\n📄 {test_case['patent_number']}",
+            f"Title: {test_case['title']}",
+            f"Score: {analysis.relevance_score:.2f}",
+            f"Category: {analysis.category}",
+            f"Key Terms: {analysis.key_terms}",
+            f"Reasoning: {analysis.reasoning}"
+        ])
 
 def check_real_foxp2_patents_manually():
     """Manually check some real FOXP2 patents that should be drug-related"""
@@ -122,33 +193,18 @@ def check_real_foxp2_patents_manually():
     print(f"\n🎯 CHECKING POTENTIALLY DRUG-RELATED PATENTS:")
     print("=" * 50)
     
-    # Create mock patents with these titles to test scoring
-    test_patents = [
-        {
-            'patent_number': 'US11679148B2',
-            'title': 'Methods and compositions for treating cancers',
-            'abstract': 'Therapeutic compositions and methods for treating cancer using pharmaceutical compounds.',
-            'raw_text': 'methods compositions treating cancers therapeutic pharmaceutical compounds treatment'
-        },
-        {
-            'patent_number': 'AU2009329380A1', 
-            'title': 'Use of FOXP2 as a marker for abnormal lymphocytes and as a target for therapy',
-            'abstract': 'FOXP2 protein as therapeutic target and biomarker for treatment of lymphocyte disorders.',
-            'raw_text': 'FOXP2 marker therapeutic target therapy treatment lymphocytes biomarker pharmaceutical'
-        }
-    ]
+    analyzer = _get_analyzer()
     
-    analyzer = ImprovedDrugDiscoveryAnalyzer()
+    analyses = analyzer.score_batch(REAL_FOXP2_TEST_PATENTS)
     
-    for patent in test_patents:
-        print(f"\n📄 {patent['patent_number']}")
-        print(f"Title: {patent['title']}")
-        
-        analysis = analyzer.analyze_drug_discovery_relevance(patent)
-        
-        print(f"Score: {analysis.relevance_score:.2f}")
-        print(f"Category: {analysis.category}")
-        print(f"Key Terms: {analysis.key_terms}")
+    for patent, analysis in zip(REAL_FOXP2_TEST_PATENTS, analyses):
+        _write_lines([
+            f"\n📄 {patent['patent_number']}",
+            f"Title: {patent['title']}",
+            f"Score: {analysis.relevance_score:.2f}",
+            f"Category: {analysis.category}",
+            f"Key Terms: {analysis.key_terms}"
+        ])
 
 if __name__ == "__main__":
     print("🔍 DETAILED DRUG DISCOVERY ANALYSIS DEBUG")
@@ -7,16 +7,38 @@ Detailed classification of 11 human therapeutic patents by:
 - Drug discovery stage
 """
 
+import os
+import sys
 import json
 import csv
 import re
+import concurrent.futures
+from collections import Counter, OrderedDict
+from operator import attrgetter
 from pathlib import Path
 from datetime import datetime
 from dataclasses import dataclass
 from typing import List, Dict, Any, Optional
+import pandas as pd
+from keyword_matcher import KeywordMatcher
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 @dataclass
 class DetailedPatentClassification:
+    __slots__ = (
+        'patent_number', 'title', 'relevance_score',
+        'molecule_type', 'molecule_subtype', 'target_pathway',
+        'filing_country', 'inventor_countries', 'assignee_country',
+        'institution_type', 'primary_assignee', 'assignee_classification',
+        'discovery_stage', 'development_phase', 'clinical_readiness', 'regulatory_pathway',
+        'therapeutic_area', 'mechanism_of_action', 'abstract'
+    )
+    
     patent_number: str
     title: str
     relevance_score: float
@@ -47,13 +69,57 @@ class DetailedPatentClassification:
     mechanism_of_action: str
     abstract: str
 
+# Columns of the human therapeutic patents CSV read by the classifiers
+LOADED_FIELDS = [
+    'patent_number', 'title', 'relevance_score', 'therapeutic_area',
+    'development_stage', 'abstract', 'assignee',
+]
+
+# Finite-domain classification fields, interned so repeated values share one string
+CATEGORY_FIELDS = (
+    'molecule_type', 'filing_country', 'assignee_country', 'institution_type',
+    'assignee_classification', 'development_phase', 'clinical_readiness',
+    'regulatory_pathway', 'mechanism_of_action'
+)
+
+# Columns written by save_detailed_results, in output order
+EXPORT_FIELDS = (
+    'patent_number', 'title', 'relevance_score',
+    'molecule_type', 'molecule_subtype', 'target_pathway',
+    'filing_country', 'assignee_country',
+    'institution_type', 'primary_assignee', 'assignee_classification',
+    'discovery_stage', 'development_phase', 'clinical_readiness', 'regulatory_pathway',
+    'therapeutic_area', 'mechanism_of_action', 'abstract'
+)
+
+# Per-process classifier used by create_detailed_classification worker processes
+_worker_classifier = None
+
+def _init_classify_worker(classifier):
+    """Install the caller's classifier (pickled once per worker process) for classifying"""
+    global _worker_classifier
+    _worker_classifier = classifier
+
+def _classify_one(patent):
+    """Classify a single patent with the worker process classifier"""
+    return _worker_classifier.classify_patent(patent)
+
 class DetailedHumanPatentClassifier:
     """Detailed classifier for human therapeutic patents"""
     
+    # Texts shorter than this are cheaper to classify again than to keep in the cache
+    MIN_CACHED_TEXT_LENGTH = 200
+    # Most text results kept; the least recently used are evicted first
+    TEXT_CACHE_SIZE = 8192
+    
     def __init__(self):
         self.results_dir = Path("patent_data/detailed_classification")
         self.results_dir.mkdir(parents=True, exist_ok=True)
         
+        # Text classification results keyed by (text, development stage); patent families
+        # share the same title and abstract across their WO/US/EP filings
+        self._text_results = OrderedDict()
+        
         # Molecule type classification
         self.molecule_types = {
             'small_molecule': {
@@ -134,6 +200,19 @@ class DetailedHumanPatentClassifier:
             'GB': 'United Kingdom'
         }
         
+        # Assignee country indicators, checked in order
+        self.country_indicators = {
+            'Singapore': ['singapore'],
+            'United States': ['usa', 'united states', 'america', 'inc', 'corp'],
+            'China': ['china', 'chinese', 'beijing', 'shanghai'],
+            'Japan': ['japan', 'japanese', 'tokyo', 'osaka'],
+            'Germany': ['germany', 'german', 'gmbh', 'ag'],
+            'United Kingdom': ['uk', 'united kingdom', 'britain', 'ltd'],
+            'Switzerland': ['switzerland', 'swiss'],
+            'France': ['france', 'french', 'sa'],
+            'Canada': ['canada', 'canadian']
+        }
+        
         # Institution type keywords
         self.institution_keywords = {
             'academic': [
@@ -152,6 +231,17 @@ class DetailedHumanPatentClassifier:
             ]
         }
         
+        # Detailed assignee classification (first matching keyword in priority order wins)
+        self.assignee_classifications = [
+            ('university', 'University'),
+            ('therapeutics', 'Pharmaceutical Company'),
+            ('pharma', 'Pharmaceutical Company'),
+            ('biotech', 'Biotechnology Company'),
+            ('inc', 'Corporation'),
+            ('corp', 'Corporation'),
+            ('institute', 'Research Institute')
+        ]
+        
         # Drug discovery stages
         self.discovery_stages = {
             'target_identification': [
@@ -179,112 +269,157 @@ class DetailedHumanPatentClassifier:
                 'regulatory approval'
             ]
         }
+        
+        # Development phase indicators, checked in order
+        self.development_phases = {
+            'Clinical Development': ['clinical trial', 'phase'],
+            'Preclinical Development': ['preclinical', 'pharmaceutical composition'],
+            'Lead Optimization': ['optimization', 'lead compound'],
+            'Drug Discovery': ['discovery', 'screening']
+        }
+        
+        self.clinical_indicators = ['clinical', 'trial', 'therapeutic', 'treatment', 'patient']
+        
+        # Regulatory pathway indicators, checked in order
+        self.regulatory_pathways = {
+            'Drug Approval (FDA/EMA)': ['drug', 'pharmaceutical'],
+            'Biologics License': ['biological', 'protein', 'antibody'],
+            'Medical Device': ['device', 'diagnostic']
+        }
+        
+        # Common mechanisms of action, checked in order
+        self.mechanisms = {
+            'Protein Degradation': ['crbn', 'degradation', 'protac', 'ubiquitin'],
+            'Kinase Inhibition': ['kinase inhibitor', 'gsk-3', 'kinase'],
+            'Receptor Modulation': ['receptor', 'agonist', 'antagonist', 'modulator'],
+            'Gene Expression': ['mrna', 'rna', 'gene expression', 'transcription'],
+            'Immune Modulation': ['immune', 'antibody', 'interferon', 'cytokine'],
+            'Cell Therapy': ['cell therapy', 'transplantation', 'cellular'],
+            'Drug Delivery': ['delivery', 'nanoparticle', 'formulation', 'composition'],
+            'Target Identification': ['target', 'screening', 'identification']
+        }
+        
+        # One matcher per classification dimension, built once and reused for every patent.
+        # Molecule type and subtype keywords share one matcher; payloads are
+        # (type index, None) for type keywords and (type index, subtype) for subtype keywords
+        self.molecule_type_names = tuple(self.molecule_types)
+        molecule_entries = []
+        for type_id, config in enumerate(self.molecule_types.values()):
+            molecule_entries += [(keyword, (type_id, None)) for keyword in config['keywords']]
+            molecule_entries += [
+                (keyword, (type_id, sub_name))
+                for sub_name, sub_keywords in config.get('subtypes', {}).items()
+                for keyword in sub_keywords
+            ]
+        self.molecule_matcher = KeywordMatcher(molecule_entries)
+        
+        self.country_matcher = KeywordMatcher(
+            (indicator, country)
+            for country, indicators in self.country_indicators.items()
+            for indicator in indicators
+        )
+        # Institution and discovery stage payloads are indices into these name tuples,
+        # so their scores can be kept in fixed-order integer lists
+        self.institution_type_names = tuple(self.institution_keywords)
+        self.institution_matcher = KeywordMatcher(
+            (keyword, inst_id)
+            for inst_id, keywords in enumerate(self.institution_keywords.values())
+            for keyword in keywords
+        )
+        self.assignee_class_matcher = KeywordMatcher(self.assignee_classifications)
+        
+        # Discovery stage, development phase, clinical and regulatory signals share one
+        # matcher; payloads are tagged with the signal they belong to
+        self.discovery_stage_names = tuple(self.discovery_stages)
+        stage_entries = [
+            (keyword, ('stage', stage_id))
+            for stage_id, keywords in enumerate(self.discovery_stages.values())
+            for keyword in keywords
+        ]
+        stage_entries += [
+            (keyword, ('phase', phase))
+            for phase, keywords in self.development_phases.items()
+            for keyword in keywords
+        ]
+        stage_entries += [(indicator, ('clinical', indicator)) for indicator in self.clinical_indicators]
+        stage_entries += [
+            (keyword, ('regulatory', pathway))
+            for pathway, keywords in self.regulatory_pathways.items()
+            for keyword in keywords
+        ]
+        self.stage_matcher = KeywordMatcher(stage_entries)
+        
+        self.mechanism_matcher = KeywordMatcher(
+            (keyword, mechanism)
+            for mechanism, keywords in self.mechanisms.items()
+            for keyword in keywords
+        )
     
     def load_human_patents(self):
         """Load the 11 human therapeutic patents"""
         csv_file = Path("patent_data/human_therapeutics/human_therapeutic_patents_20250821_065621.csv")
         
-        patents = []
-        with open(csv_file, 'r') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                patents.append(row)
+        # Parse only the columns the classifiers use; keep every value as the raw string
+        # (no NaN conversion) so rows look exactly like csv.DictReader rows
+        df = pd.read_csv(csv_file, usecols=LOADED_FIELDS, dtype=str, keep_default_na=False)
+        patents = df.to_dict('records')
+        
+        # Therapeutic area and development stage take a handful of values; intern them
+        for patent in patents:
+            patent['therapeutic_area'] = sys.intern(patent['therapeutic_area'])
+            patent['development_stage'] = sys.intern(patent['development_stage'])
         
         print(f"✅ Loaded {len(patents)} human therapeutic patents for detailed classification")
         return patents
     
-    def classify_molecule_type(self, patent):
-        """Classify molecule type and subtype"""
-        text = f"{patent['title']} {patent['abstract']}".lower()
-        
-        molecule_scores = {}
-        for mol_type, config in self.molecule_types.items():
-            score = 0
-            for keyword in config['keywords']:
-                if keyword.lower() in text:
-                    score += 1
-            if score > 0:
-                molecule_scores[mol_type] = score
-        
-        if molecule_scores:
-            best_type = max(molecule_scores.items(), key=lambda x: x[1])[0]
-            
-            # Find subtype
-            subtype = 'general'
-            if best_type in self.molecule_types:
-                subtypes = self.molecule_types[best_type].get('subtypes', {})
-                for sub_name, sub_keywords in subtypes.items():
-                    for keyword in sub_keywords:
-                        if keyword.lower() in text:
-                            subtype = sub_name
-                            break
-                    if subtype != 'general':
-                        break
-            
-            return best_type, subtype
+    def classify_molecule_type(self, text):
+        """Classify molecule type and subtype from lower-cased title and abstract"""
+        # Count type keywords and note the first matching subtype of every type in one pass
+        type_scores = [0] * len(self.molecule_type_names)
+        first_subtypes = [None] * len(self.molecule_type_names)
+        
+        for type_id, sub_name in self.molecule_matcher.find(text):
+            if sub_name is None:
+                type_scores[type_id] += 1
+            elif first_subtypes[type_id] is None:
+                first_subtypes[type_id] = sub_name
+        
+        best_score = max(type_scores)
+        if best_score > 0:
+            best_id = type_scores.index(best_score)
+            return self.molecule_type_names[best_id], first_subtypes[best_id] or 'general'
         else:
             return 'unclassified', 'unknown'
     
-    def extract_geographic_info(self, patent):
-        """Extract geographic information"""
-        patent_number = patent['patent_number']
-        
-        # Extract filing country from patent number prefix
-        filing_country = 'Unknown'
-        for code, country in self.country_codes.items():
-            if patent_number.startswith(code):
-                filing_country = country
-                break
-        
-        # Extract assignee country from assignee info (if available)
-        assignee = patent.get('assignee', '')
-        assignee_country = 'Unknown'
-        
-        # Look for country indicators in assignee
-        country_indicators = {
-            'Singapore': ['singapore'],
-            'United States': ['usa', 'united states', 'america', 'inc', 'corp'],
-            'China': ['china', 'chinese', 'beijing', 'shanghai'],
-            'Japan': ['japan', 'japanese', 'tokyo', 'osaka'],
-            'Germany': ['germany', 'german', 'gmbh', 'ag'],
-            'United Kingdom': ['uk', 'united kingdom', 'britain', 'ltd'],
-            'Switzerland': ['switzerland', 'swiss'],
-            'France': ['france', 'french', 'sa'],
-            'Canada': ['canada', 'canadian']
-        }
+    def extract_geographic_info(self, patent_number, assignee):
+        """Extract geographic information from the patent number and lower-cased assignee"""
+        # Extract filing country from patent number prefix (all country codes are two letters)
+        filing_country = self.country_codes.get(patent_number[:2], 'Unknown')
         
-        assignee_lower = assignee.lower()
-        for country, indicators in country_indicators.items():
-            for indicator in indicators:
-                if indicator in assignee_lower:
-                    assignee_country = country
-                    break
-            if assignee_country != 'Unknown':
-                break
+        # Look for country indicators in assignee (first country in priority order)
+        assignee_country = self.country_matcher.find_first(assignee, default='Unknown')
         
         return filing_country, [assignee_country], assignee_country
     
-    def classify_institution_type(self, patent):
-        """Classify institution type and assignee"""
-        assignee = patent.get('assignee', '').lower()
-        
+    def classify_institution_type(self, assignee):
+        """Classify institution type and assignee from the lower-cased assignee"""
         if not assignee or assignee == 'nan':
             return 'unknown', 'Unknown', 'unclassified'
         
         # Score different institution types
-        scores = {'academic': 0, 'corporate': 0, 'government': 0}
+        scores = [0] * len(self.institution_type_names)
+        
+        for inst_id in self.institution_matcher.find(assignee):
+            scores[inst_id] += 1
         
-        for inst_type, keywords in self.institution_keywords.items():
-            for keyword in keywords:
-                if keyword in assignee:
-                    scores[inst_type] += 1
+        academic, corporate, government = scores
         
         # Determine primary type
-        if scores['academic'] > scores['corporate'] and scores['academic'] > scores['government']:
+        if academic > corporate and academic > government:
             institution_type = 'academic'
-        elif scores['corporate'] > scores['government']:
+        elif corporate > government:
             institution_type = 'corporate'
-        elif scores['government'] > 0:
+        elif government > 0:
             institution_type = 'government'
         else:
             institution_type = 'unknown'
@@ -295,57 +430,39 @@ class DetailedHumanPatentClassifier:
             primary_assignee = primary_assignee[:60] + "..."
         
         # Detailed classification
-        if 'university' in assignee:
-            assignee_classification = 'University'
-        elif 'therapeutics' in assignee or 'pharma' in assignee:
-            assignee_classification = 'Pharmaceutical Company'
-        elif 'biotech' in assignee:
-            assignee_classification = 'Biotechnology Company'
-        elif 'inc' in assignee or 'corp' in assignee:
-            assignee_classification = 'Corporation'
-        elif 'institute' in assignee:
-            assignee_classification = 'Research Institute'
-        else:
-            assignee_classification = 'Other'
+        assignee_classification = self.assignee_class_matcher.find_first(assignee, default='Other')
         
         return institution_type, primary_assignee, assignee_classification
     
-    def classify_discovery_stage(self, patent):
-        """Classify drug discovery and development stage"""
-        text = f"{patent['title']} {patent['abstract']} {patent.get('development_stage', '')}".lower()
-        
-        # Score different stages
-        stage_scores = {}
-        for stage, keywords in self.discovery_stages.items():
-            score = 0
-            for keyword in keywords:
-                if keyword.lower() in text:
-                    score += 1
-            if score > 0:
-                stage_scores[stage] = score
+    def classify_discovery_stage(self, text):
+        """Classify drug discovery and development stage from lower-cased patent text"""
+        # Score different stages and collect the other stage signals in the same pass
+        stage_scores = [0] * len(self.discovery_stage_names)
+        development_phase = None
+        clinical_score = 0
+        regulatory_pathway = None
+        
+        for signal, value in self.stage_matcher.find(text):
+            if signal == 'stage':
+                stage_scores[value] += 1
+            elif signal == 'phase':
+                development_phase = development_phase or value
+            elif signal == 'clinical':
+                clinical_score += 1
+            else:
+                regulatory_pathway = regulatory_pathway or value
         
         # Determine primary stage
-        if stage_scores:
-            discovery_stage = max(stage_scores.items(), key=lambda x: x[1])[0]
+        best_score = max(stage_scores)
+        if best_score > 0:
+            discovery_stage = self.discovery_stage_names[stage_scores.index(best_score)]
         else:
             discovery_stage = 'research'
         
         # Determine development phase
-        if 'clinical trial' in text or 'phase' in text:
-            development_phase = 'Clinical Development'
-        elif 'preclinical' in text or 'pharmaceutical composition' in text:
-            development_phase = 'Preclinical Development'
-        elif 'optimization' in text or 'lead compound' in text:
-            development_phase = 'Lead Optimization'
-        elif 'discovery' in text or 'screening' in text:
-            development_phase = 'Drug Discovery'
-        else:
-            development_phase = 'Basic Research'
+        development_phase = development_phase or 'Basic Research'
         
         # Clinical readiness assessment
-        clinical_indicators = ['clinical', 'trial', 'therapeutic', 'treatment', 'patient']
-        clinical_score = sum(1 for indicator in clinical_indicators if indicator in text)
-        
         if clinical_score >= 3:
             clinical_readiness = 'High'
         elif clinical_score >= 2:
@@ -354,153 +471,155 @@ class DetailedHumanPatentClassifier:
             clinical_readiness = 'Low'
         
         # Regulatory pathway
-        if 'drug' in text or 'pharmaceutical' in text:
-            regulatory_pathway = 'Drug Approval (FDA/EMA)'
-        elif 'biological' in text or 'protein' in text or 'antibody' in text:
-            regulatory_pathway = 'Biologics License'
-        elif 'device' in text or 'diagnostic' in text:
-            regulatory_pathway = 'Medical Device'
-        else:
-            regulatory_pathway = 'To Be Determined'
+        regulatory_pathway = regulatory_pathway or 'To Be Determined'
         
         return discovery_stage, development_phase, clinical_readiness, regulatory_pathway
     
-    def extract_mechanism_of_action(self, patent):
-        """Extract mechanism of action"""
+    def extract_mechanism_of_action(self, text):
+        """Extract mechanism of action from lower-cased title and abstract"""
+        # First mechanism (in priority order) with a matching keyword
+        return self.mechanism_matcher.find_first(text, default='Unknown/Other')
+    
+    def classify_text(self, text, development_stage):
+        """Run the text classifiers on lower-cased patent text, reusing earlier results"""
+        key = (text, development_stage)
+        results = self._text_results.get(key)
+        
+        if results is None:
+            results = (
+                self.classify_molecule_type(text),
+                self.classify_discovery_stage(f"{text} {development_stage}"),
+                self.extract_mechanism_of_action(text)
+            )
+            if len(text) >= self.MIN_CACHED_TEXT_LENGTH:
+                self._text_results[key] = results
+                if len(self._text_results) > self.TEXT_CACHE_SIZE:
+                    self._text_results.popitem(last=False)
+        else:
+            self._text_results.move_to_end(key)
+        
+        return results
+    
+    def classify_patent(self, patent) -> DetailedPatentClassification:
+        """Run every classifier on a single patent"""
+        # Lower-case the patent text and assignee once and share them between the classifiers
         text = f"{patent['title']} {patent['abstract']}".lower()
+        development_stage = str(patent.get('development_stage', '')).lower()
+        assignee = patent.get('assignee', '').lower()
         
-        # Common mechanisms
-        mechanisms = {
-            'Protein Degradation': ['crbn', 'degradation', 'protac', 'ubiquitin'],
-            'Kinase Inhibition': ['kinase inhibitor', 'gsk-3', 'kinase'],
-            'Receptor Modulation': ['receptor', 'agonist', 'antagonist', 'modulator'],
-            'Gene Expression': ['mrna', 'rna', 'gene expression', 'transcription'],
-            'Immune Modulation': ['immune', 'antibody', 'interferon', 'cytokine'],
-            'Cell Therapy': ['cell therapy', 'transplantation', 'cellular'],
-            'Drug Delivery': ['delivery', 'nanoparticle', 'formulation', 'composition'],
-            'Target Identification': ['target', 'screening', 'identification']
-        }
+        # Molecule, discovery stage and mechanism classification
+        (molecule_type, molecule_subtype), stage_info, mechanism_of_action = self.classify_text(text, development_stage)
+        discovery_stage, development_phase, clinical_readiness, regulatory_pathway = stage_info
         
-        for mechanism, keywords in mechanisms.items():
-            for keyword in keywords:
-                if keyword in text:
-                    return mechanism
+        # Geographic classification
+        filing_country, inventor_countries, assignee_country = self.extract_geographic_info(patent['patent_number'], assignee)
         
-        return 'Unknown/Other'
-    
-    def create_detailed_classification(self, patents):
-        """Create detailed classification for all patents"""
+        # Institution classification
+        institution_type, primary_assignee, assignee_classification = self.classify_institution_type(assignee)
         
-        print(f"\n🔬 DETAILED CLASSIFICATION OF 11 HUMAN THERAPEUTIC PATENTS")
-        print("=" * 65)
+        # Extract target pathway
+        target_pathway = 'FOXP2-related'  # All patents are FOXP2-related
         
-        detailed_patents = []
+        abstract = patent.get('abstract', '')
         
-        for patent in patents:
-            # Molecule classification
-            molecule_type, molecule_subtype = self.classify_molecule_type(patent)
-            
-            # Geographic classification
-            filing_country, inventor_countries, assignee_country = self.extract_geographic_info(patent)
+        return DetailedPatentClassification(
+            patent_number=patent['patent_number'],
+            title=patent['title'],
+            relevance_score=float(patent['relevance_score']),
             
-            # Institution classification
-            institution_type, primary_assignee, assignee_classification = self.classify_institution_type(patent)
+            molecule_type=molecule_type,
+            molecule_subtype=molecule_subtype,
+            target_pathway=target_pathway,
             
-            # Discovery stage classification
-            discovery_stage, development_phase, clinical_readiness, regulatory_pathway = self.classify_discovery_stage(patent)
+            filing_country=filing_country,
+            inventor_countries=inventor_countries,
+            assignee_country=assignee_country,
             
-            # Extract mechanism
-            mechanism_of_action = self.extract_mechanism_of_action(patent)
+            institution_type=institution_type,
+            primary_assignee=primary_assignee,
+            assignee_classification=assignee_classification,
             
-            # Extract target pathway
-            target_pathway = 'FOXP2-related'  # All patents are FOXP2-related
+            discovery_stage=discovery_stage,
+            development_phase=development_phase,
+            clinical_readiness=clinical_readiness,
+            regulatory_pathway=regulatory_pathway,
             
-            classification = DetailedPatentClassification(
-                patent_number=patent['patent_number'],
-                title=patent['title'],
-                relevance_score=float(patent['relevance_score']),
-                
-                molecule_type=molecule_type,
-                molecule_subtype=molecule_subtype,
-                target_pathway=target_pathway,
-                
-                filing_country=filing_country,
-                inventor_countries=inventor_countries,
-                assignee_country=assignee_country,
-                
-                institution_type=institution_type,
-                primary_assignee=primary_assignee,
-                assignee_classification=assignee_classification,
-                
-                discovery_stage=discovery_stage,
-                development_phase=development_phase,
-                clinical_readiness=clinical_readiness,
-                regulatory_pathway=regulatory_pathway,
-                
-                therapeutic_area=patent['therapeutic_area'],
-                mechanism_of_action=mechanism_of_action,
-                abstract=patent.get('abstract', '')[:300] + "..." if len(patent.get('abstract', '')) > 300 else patent.get('abstract', '')
-            )
+            therapeutic_area=patent['therapeutic_area'],
+            mechanism_of_action=mechanism_of_action,
+            abstract=abstract[:300] + "..." if len(abstract) > 300 else abstract
+        )
+    
+    def create_detailed_classification(self, patents, parallel_threshold=32):
+        """Create detailed classification for all patents, ordered by relevance score
+        
+        Batches larger than `parallel_threshold` are spread over a process pool;
+        smaller ones are classified inline since pool start-up would dominate.
+        """
+        
+        print(f"\n🔬 DETAILED CLASSIFICATION OF 11 HUMAN THERAPEUTIC PATENTS")
+        print("=" * 65)
+        
+        if len(patents) <= parallel_threshold:
+            detailed_patents = [self.classify_patent(patent) for patent in patents]
+        else:
+            chunksize = max(1, len(patents) // (4 * (os.cpu_count() or 1)))
+            with concurrent.futures.ProcessPoolExecutor(initializer=_init_classify_worker,
+                                                        initargs=(self,)) as executor:
+                detailed_patents = list(executor.map(_classify_one, patents, chunksize=chunksize))
             
-            detailed_patents.append(classification)
+            # Results come back unpickled with their own copy of every label; inline
+            # classification already shares the classifier's table strings
+            for patent in detailed_patents:
+                for field in CATEGORY_FIELDS:
+                    setattr(patent, field, sys.intern(getattr(patent, field)))
         
+        # Sort by relevance score once here, so reports and exports can use the list as-is
+        detailed_patents.sort(key=lambda x: x.relevance_score, reverse=True)
         return detailed_patents
     
     def generate_detailed_report(self, detailed_patents):
-        """Generate comprehensive detailed report"""
+        """Generate comprehensive detailed report
+        
+        Patents are listed in the order given, i.e. by relevance score when they
+        come from create_detailed_classification.
+        """
         
         print(f"\n📊 DETAILED PATENT CLASSIFICATION ANALYSIS")
         print("=" * 55)
         
-        # Sort by relevance score
-        detailed_patents.sort(key=lambda x: x.relevance_score, reverse=True)
+        # Count all four distributions from a single pass over the patents: attrgetter pulls
+        # the four fields of each patent and zip transposes them into per-field columns
+        molecule_column, country_column, institution_column, stage_column = zip(
+            *map(attrgetter('molecule_type', 'filing_country', 'institution_type', 'development_phase'),
+                 detailed_patents)
+        ) if detailed_patents else ((), (), (), ())
         
         # Molecule type analysis
-        molecule_counts = {}
-        for patent in detailed_patents:
-            mol_type = patent.molecule_type
-            if mol_type not in molecule_counts:
-                molecule_counts[mol_type] = 0
-            molecule_counts[mol_type] += 1
+        molecule_counts = Counter(molecule_column)
         
         print(f"\n🧬 MOLECULE TYPE DISTRIBUTION:")
-        for mol_type, count in sorted(molecule_counts.items(), key=lambda x: x[1], reverse=True):
+        for mol_type, count in molecule_counts.most_common():
             print(f"   {mol_type.replace('_', ' ').title()}: {count} patents")
         
         # Geographic analysis
-        country_counts = {}
-        for patent in detailed_patents:
-            country = patent.filing_country
-            if country not in country_counts:
-                country_counts[country] = 0
-            country_counts[country] += 1
+        country_counts = Counter(country_column)
         
         print(f"\n🌍 GEOGRAPHIC DISTRIBUTION (Filing Country):")
-        for country, count in sorted(country_counts.items(), key=lambda x: x[1], reverse=True):
+        for country, count in country_counts.most_common():
             print(f"   {country}: {count} patents")
         
         # Institution analysis
-        institution_counts = {}
-        for patent in detailed_patents:
-            inst_type = patent.institution_type
-            if inst_type not in institution_counts:
-                institution_counts[inst_type] = 0
-            institution_counts[inst_type] += 1
+        institution_counts = Counter(institution_column)
         
         print(f"\n🏢 INSTITUTIONAL DISTRIBUTION:")
-        for inst_type, count in sorted(institution_counts.items(), key=lambda x: x[1], reverse=True):
+        for inst_type, count in institution_counts.most_common():
             print(f"   {inst_type.title()}: {count} patents")
         
         # Development stage analysis
-        stage_counts = {}
-        for patent in detailed_patents:
-            stage = patent.development_phase
-            if stage not in stage_counts:
-                stage_counts[stage] = 0
-            stage_counts[stage] += 1
+        stage_counts = Counter(stage_column)
         
         print(f"\n🔬 DEVELOPMENT STAGE DISTRIBUTION:")
-        for stage, count in sorted(stage_counts.items(), key=lambda x: x[1], reverse=True):
+        for stage, count in stage_counts.most_common():
             print(f"   {stage}: {count} patents")
         
         # Detailed patent listing
@@ -524,41 +643,25 @@ class DetailedHumanPatentClassifier:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         # Convert to dictionaries for export
-        export_data = []
-        for patent in detailed_patents:
-            export_data.append({
-                'patent_number': patent.patent_number,
-                'title': patent.title,
-                'relevance_score': patent.relevance_score,
-                'molecule_type': patent.molecule_type,
-                'molecule_subtype': patent.molecule_subtype,
-                'target_pathway': patent.target_pathway,
-                'filing_country': patent.filing_country,
-                'assignee_country': patent.assignee_country,
-                'institution_type': patent.institution_type,
-                'primary_assignee': patent.primary_assignee,
-                'assignee_classification': patent.assignee_classification,
-                'discovery_stage': patent.discovery_stage,
-                'development_phase': patent.development_phase,
-                'clinical_readiness': patent.clinical_readiness,
-                'regulatory_pathway': patent.regulatory_pathway,
-                'therapeutic_area': patent.therapeutic_area,
-                'mechanism_of_action': patent.mechanism_of_action,
-                'abstract': patent.abstract
-            })
+        export_data = [{field: getattr(patent, field) for field in EXPORT_FIELDS} for patent in detailed_patents]
         
         # Save as CSV
         csv_file = self.results_dir / f"detailed_human_patent_classification_{timestamp}.csv"
-        with open(csv_file, 'w', newline='', encoding='utf-8') as f:
+        with open(csv_file, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
             if export_data:
-                writer = csv.DictWriter(f, fieldnames=export_data[0].keys())
-                writer.writeheader()
-                writer.writerows(export_data)
+                # Rows are built in EXPORT_FIELDS order, so their values are written as-is
+                writer = csv.writer(f)
+                writer.writerow(EXPORT_FIELDS)
+                writer.writerows(row.values() for row in export_data)
         
         # Save as JSON
         json_file = self.results_dir / f"detailed_human_patent_classification_{timestamp}.json"
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False)
+        if ORJSON_AVAILABLE:
+            with open(json_file, 'wb') as f:
+                f.write(orjson.dumps(export_data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(json_file, 'w', encoding='utf-8') as f:
+                json.dump(export_data, f, indent=2, ensure_ascii=False)
         
         print(f"\n💾 Detailed Classification Results Saved:")
         print(f"   📊 CSV: {csv_file}")
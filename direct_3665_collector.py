@@ -10,6 +10,12 @@ from pathlib import Path
 from datetime import datetime
 from improved_drug_analyzer import ImprovedDrugDiscoveryAnalyzer
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 def collect_and_analyze_all_3665():
     """Use the exact same approach that successfully collected 473 patents, but target all 3,665"""
     
@@ -48,20 +54,24 @@ def collect_and_analyze_all_3665():
     
     # Save raw patents as JSON
     raw_json_file = results_dir / f"all_foxp2_patents_raw_{timestamp}.json"
-    with open(raw_json_file, 'w', encoding='utf-8') as f:
-        json.dump(all_patents, f, indent=2, ensure_ascii=False)
+    if ORJSON_AVAILABLE:
+        with open(raw_json_file, 'wb') as f:
+            f.write(orjson.dumps(all_patents, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(raw_json_file, 'w', encoding='utf-8') as f:
+            json.dump(all_patents, f, indent=2, ensure_ascii=False)
     
     # Save raw patents as CSV
     raw_csv_file = results_dir / f"all_foxp2_patents_raw_{timestamp}.csv"
     if all_patents:
-        with open(raw_csv_file, 'w', newline='', encoding='utf-8') as f:
-            all_keys = set()
-            for patent in all_patents:
-                all_keys.update(patent.keys())
-            
-            writer = csv.DictWriter(f, fieldnames=sorted(all_keys))
-            writer.writeheader()
-            writer.writerows(all_patents)
+        with open(raw_csv_file, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
+            # Every patent comes from the same record builder and carries the same keys, so
+            # the columns are taken from a small sample instead of scanning every patent;
+            # a key that only appears after the sample would not be written
+            fieldnames = sorted({key for patent in all_patents[:32] for key in patent})
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            writer.writerows([patent.get(key, '') for key in fieldnames] for patent in all_patents)
     
     print(f"💾 Raw patents saved:")
     print(f"   📄 JSON: {raw_json_file}")
@@ -4,33 +4,136 @@ Comprehensive FOXP2 Patent Drug Discovery Analyzer
 Gathers all 3,665 patents and filters for drug discovery relevance
 """
 
+import os
+import sys
 import time
+import random
 import re
 import json
+import hashlib
 import csv
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional
 from urllib.parse import quote_plus
 from pathlib import Path
 from datetime import datetime
 import concurrent.futures
+import multiprocessing.util
+from collections import Counter, deque
 from dataclasses import dataclass
+from keyword_matcher import shared_matcher
 
-@dataclass
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    # Dataclasses and datetimes go through default=str, as with the stdlib encoder
+    ORJSON_DUMP_OPTIONS = (orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS |
+                           orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME)
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Google Patents search for FOXP2; result pages append &num= and &page=
+FOXP2_SEARCH_URL = f"https://patents.google.com/?q={quote_plus('FOXP2')}"
+PATENT_URL_PREFIX = "https://patents.google.com/patent/"
+
+# Patterns used when extracting search result items, compiled once.
+# Patent numbers: group 1 is a country-code number, group 2 a WO number. The former
+# US-specific alternative is omitted since every string it matches also matches group 1.
+PATENT_NUMBER_RE = re.compile(r'\b(?:([A-Z]{2}\d{7,10}[A-Z]?\d?)|(WO\d{4}/\d{6}))\b')
+PUBLISHED_DATE_RE = re.compile(r'Published (\d{4}-\d{2}-\d{2})')
+FILED_DATE_RE = re.compile(r'Filed (\d{4}-\d{2}-\d{2})')
+
+# Lower-case markers for assignee lines and for long lines that are metadata, not abstract
+ASSIGNEE_INDICATORS = ('inc', 'corp', 'ltd', 'company', 'university', 'foundation', 'institute')
+ABSTRACT_SKIP_MARKERS = ('patent', 'filed', 'published', 'priority')
+
+# JSON schema for structured OpenAI responses: one DrugDiscoveryAnalysis-shaped entry per patent
+OPENAI_ANALYSES_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "analyses": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "patent_index": {"type": "integer"},
+                    "relevance_score": {"type": "number"},
+                    "category": {"type": "string"},
+                    "confidence": {"type": "number"},
+                    "key_terms": {"type": "array", "items": {"type": "string"}},
+                    "reasoning": {"type": "string"}
+                },
+                "required": ["patent_index", "relevance_score", "category", "confidence", "key_terms", "reasoning"],
+                "additionalProperties": False
+            }
+        }
+    },
+    "required": ["analyses"],
+    "additionalProperties": False
+}
+
+def _dumps_indented(obj: Any) -> str:
+    """Encode obj as two-space indented JSON, with orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=str, option=ORJSON_DUMP_OPTIONS).decode('utf-8')
+    return json.dumps(obj, indent=2, default=str)
+
+# Per-process analyzer and browser used by gather_all_foxp2_patents worker processes
+_worker_analyzer = None
+_worker_driver = None
+
+def _init_page_worker(analyzer_class):
+    """Build one analyzer and start one headless browser per worker process"""
+    global _worker_analyzer, _worker_driver
+    _worker_analyzer = analyzer_class()
+    _worker_driver = analyzer_class._create_driver()
+    # Pool workers skip atexit handlers on exit, but run multiprocessing finalizers
+    multiprocessing.util.Finalize(None, _worker_driver.quit, exitpriority=10)
+
+def _fetch_page(search_url: str, page_num: int, max_pages: int) -> Optional[List[Dict[str, Any]]]:
+    """Fetch one results page with the worker process browser"""
+    try:
+        return _worker_analyzer._fetch_search_page(_worker_driver, search_url, page_num, max_pages)
+    finally:
+        time.sleep(random.uniform(0.5, 2.0))  # Rate limiting, jittered so workers do not load in lockstep
+
+@dataclass(repr=False)
 class DrugDiscoveryAnalysis:
     """Results of drug discovery relevance analysis"""
+    # Slotted and without field defaults (a default would clash with its slot on Python < 3.10)
+    __slots__ = ('relevance_score', 'category', 'confidence', 'key_terms', 'reasoning', 'terms_by_category')
+    
     relevance_score: float  # 0-100
     category: str  # e.g., "Target", "Compound", "Biomarker", "Therapeutic"
     confidence: float  # 0-100
     key_terms: List[str]
     reasoning: str
+    terms_by_category: Dict[str, List[str]]  # keyword hits per category (empty for OpenAI analyses)
+    
+    def __repr__(self):
+        # terms_by_category is left out: saved results embed this repr (via default=str),
+        # and their format predates the field
+        return (f"{self.__class__.__qualname__}(relevance_score={self.relevance_score!r}, "
+                f"category={self.category!r}, confidence={self.confidence!r}, "
+                f"key_terms={self.key_terms!r}, reasoning={self.reasoning!r})")
 
 class DrugDiscoveryPatentAnalyzer:
     """Comprehensive analyzer for FOXP2 patents with drug discovery focus"""
     
+    OPENAI_MODEL = "gpt-4o-mini"
+    OPENAI_BATCH_SIZE = 20  # patents per request
+    # Keyword analysis reads only title and abstract, so the full result-item text is
+    # dropped from collected records unless a subclass scores it
+    KEEP_RAW_TEXT = False
+    
     def __init__(self):
         self.results_dir = Path("patent_data/drug_discovery_analysis")
         self.results_dir.mkdir(parents=True, exist_ok=True)
         
+        # OpenAI analyses are cached on disk by content hash so reruns skip the API;
+        # results already read or fetched in this run are also kept in memory
+        self.openai_cache_dir = self.results_dir / "openai_cache"
+        self._openai_results: Dict[str, Dict[str, Any]] = {}
+        
         # Drug discovery keywords and patterns
         self.drug_discovery_keywords = {
             'therapeutic_targets': [
@@ -72,71 +175,73 @@ class DrugDiscoveryPatentAnalyzer:
             'genetic testing', 'screening method', 'research tool', 'laboratory method',
             'bioinformatics', 'software', 'algorithm', 'database', 'computer system'
         ]
+        
+        # Keywords and exclusion patterns share one matcher, so each patent text is scanned
+        # once; payloads are (category, keyword), with category None for exclusion patterns.
+        # The matcher is shared by every analyzer built in this process with the same tables
+        self.relevance_matcher = shared_matcher(
+            [(keyword, (category, keyword))
+             for category, keywords in self.drug_discovery_keywords.items()
+             for keyword in keywords] +
+            [(pattern, (None, pattern)) for pattern in self.exclusion_patterns]
+        )
+        self.max_possible_score = sum(len(keywords) for keywords in self.drug_discovery_keywords.values())
+        # No keyword or pattern can occur in a text shorter than this
+        self.min_keyword_length = min(map(len, self.relevance_matcher.keywords), default=0)
     
-    def gather_all_foxp2_patents(self, max_patents: int = 3665) -> List[Dict[str, Any]]:
-        """Gather all FOXP2 patents with enhanced data extraction"""
+    def gather_all_foxp2_patents(self, max_patents: int = 3665, page_workers: int = 4) -> List[Dict[str, Any]]:
+        """Gather all FOXP2 patents with enhanced data extraction
+        
+        Result pages are loaded by `page_workers` processes, each driving its own
+        headless browser (Selenium drivers cannot be shared between threads). Pages
+        are still merged strictly in page order, so deduplication, the stop on a page
+        without new results and the checkpoints behave as in a sequential crawl.
+        """
         try:
-            from selenium import webdriver
-            from selenium.webdriver.chrome.options import Options
-            from selenium.webdriver.common.by import By
-            from selenium.webdriver.support.ui import WebDriverWait
-            
-            chrome_options = Options()
-            chrome_options.add_argument("--headless")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--window-size=1920,1080")
-            
-            driver = webdriver.Chrome(options=chrome_options)
             all_patents = []
             seen_patents = set()
             
-            try:
-                base_url = f"https://patents.google.com/?q={quote_plus('FOXP2')}"
-                results_per_page = 100  # Maximum allowed by Google Patents
-                max_pages = (max_patents // results_per_page) + 1
+            results_per_page = 100  # Maximum allowed by Google Patents
+            max_pages = (max_patents // results_per_page) + 1
+            
+            print(f"🧬 Starting comprehensive FOXP2 patent collection")
+            print(f"🎯 Target: {max_patents} patents across {max_pages} pages")
+            print(f"📊 Using {results_per_page} results per page")
+            
+            with concurrent.futures.ProcessPoolExecutor(max_workers=page_workers,
+                                                        initializer=_init_page_worker,
+                                                        initargs=(type(self),)) as executor:
+                page_nums = iter(range(1, max_pages + 1))
+                pending = deque()
                 
-                print(f"🧬 Starting comprehensive FOXP2 patent collection")
-                print(f"🎯 Target: {max_patents} patents across {max_pages} pages")
-                print(f"📊 Using {results_per_page} results per page")
+                def submit_next():
+                    page_num = next(page_nums, None)
+                    if page_num is not None:
+                        search_url = f"{FOXP2_SEARCH_URL}&num={results_per_page}&page={page_num}"
+                        pending.append((page_num, executor.submit(_fetch_page, search_url, page_num, max_pages)))
                 
-                for page_num in range(1, max_pages + 1):
-                    if len(all_patents) >= max_patents:
-                        break
-                    
-                    search_url = f"{base_url}&num={results_per_page}&page={page_num}"
-                    print(f"\n📄 Page {page_num}/{max_pages}: {search_url}")
-                    
-                    driver.get(search_url)
-                    time.sleep(3)
-                    
-                    # Wait for results
-                    try:
-                        WebDriverWait(driver, 15).until(
-                            lambda d: d.find_elements(By.TAG_NAME, 'search-result-item')
-                        )
-                    except:
-                        print(f"   ⚠️ Timeout on page {page_num}")
+                for _ in range(page_workers):
+                    submit_next()
+                
+                while pending:
+                    page_num, future = pending.popleft()
+                    page_patents = future.result()
+                    if page_patents is None:
+                        # Timed out waiting for results; move on to the next page
+                        submit_next()
                         continue
                     
-                    search_items = driver.find_elements(By.TAG_NAME, 'search-result-item')
-                    print(f"   📊 Found {len(search_items)} items on page")
-                    
                     page_results = 0
-                    for i, item in enumerate(search_items):
-                        try:
-                            patent_data = self._extract_enhanced_patent_data(item, page_num, i)
-                            if patent_data and patent_data['patent_number'] not in seen_patents:
-                                seen_patents.add(patent_data['patent_number'])
-                                all_patents.append(patent_data)
-                                page_results += 1
-                                
-                                if len(all_patents) >= max_patents:
-                                    break
-                        except Exception as e:
-                            continue
+                    for patent_data in page_patents:
+                        if patent_data['patent_number'] not in seen_patents:
+                            seen_patents.add(patent_data['patent_number'])
+                            all_patents.append(patent_data)
+                            page_results += 1
+                            
+                            if len(all_patents) >= max_patents:
+                                break
                     
-                    print(f"   ✅ Extracted {page_results} patents (Total: {len(all_patents)})")
+                    print(f"   ✅ Page {page_num}: extracted {page_results} patents (Total: {len(all_patents)})")
                     
                     if page_results == 0:
                         print(f"   ⚠️ No new results, stopping at page {page_num}")
@@ -146,49 +251,95 @@ class DrugDiscoveryPatentAnalyzer:
                     if page_num % 10 == 0:
                         self._save_patents_checkpoint(all_patents, page_num)
                     
-                    time.sleep(1)  # Rate limiting
-                
-                print(f"\n🎯 Collection complete: {len(all_patents)} patents gathered")
-                return all_patents
+                    if len(all_patents) >= max_patents:
+                        break
+                    
+                    submit_next()
                 
-            finally:
-                driver.quit()
+                # Pages fetched ahead of a stop are not needed
+                for _, future in pending:
+                    future.cancel()
+            
+            print(f"\n🎯 Collection complete: {len(all_patents)} patents gathered")
+            return all_patents
                 
         except Exception as e:
             print(f"❌ Error gathering patents: {e}")
             return []
     
+    @staticmethod
+    def _create_driver():
+        """Start a headless Chrome configured for loading search result pages"""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--window-size=1920,1080")
+        # Results are rendered by the page's scripts; images and subresources are not needed
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.page_load_strategy = 'eager'
+        
+        return webdriver.Chrome(options=chrome_options)
+    
+    def _fetch_search_page(self, driver, search_url: str, page_num: int,
+                           max_pages: int) -> Optional[List[Dict[str, Any]]]:
+        """Load one search results page and extract its patents, or None on timeout"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        
+        print(f"\n📄 Page {page_num}/{max_pages}: {search_url}")
+        
+        driver.get(search_url)
+        
+        # Wait for results (returns as soon as they render, no fixed delay)
+        try:
+            WebDriverWait(driver, 15).until(
+                lambda d: d.find_elements(By.TAG_NAME, 'search-result-item')
+            )
+        except:
+            print(f"   ⚠️ Timeout on page {page_num}")
+            return None
+        
+        search_items = driver.find_elements(By.TAG_NAME, 'search-result-item')
+        print(f"   📊 Found {len(search_items)} items on page {page_num}")
+        
+        page_patents = []
+        for i, item in enumerate(search_items):
+            try:
+                patent_data = self._extract_enhanced_patent_data(item, page_num, i)
+                if patent_data:
+                    page_patents.append(patent_data)
+            except Exception as e:
+                continue
+        
+        return page_patents
+    
     def _extract_enhanced_patent_data(self, item, page_num: int, item_index: int) -> Optional[Dict[str, Any]]:
         """Extract enhanced patent data including abstract and detailed metadata"""
         try:
             text_content = item.text
             
-            # Extract patent number
-            patent_patterns = [
-                r'\b([A-Z]{2}\d{7,10}[A-Z]?\d?)\b',
-                r'\b(WO\d{4}/\d{6})\b',
-                r'\b(US\d{7,10}[A-Z]\d?)\b'
-            ]
-            
+            # Extract patent number in one scan: the first country-code number anywhere
+            # in the text wins, otherwise the first WO number
             patent_number = ''
-            for pattern in patent_patterns:
-                match = re.search(pattern, text_content)
-                if match:
+            for match in PATENT_NUMBER_RE.finditer(text_content):
+                if match.group(1):
                     patent_number = match.group(1)
                     break
+                patent_number = patent_number or match.group(2)
             
             if not patent_number:
                 return None
             
-            # Extract title
+            # Extract title. Date lines (10 chars) and country-code lines (2-5 chars)
+            # can never pass the length check, so they need no separate test
             lines = [line.strip() for line in text_content.split('\n') if line.strip()]
             title = ''
             for line in lines:
-                if (len(line) > 15 and 
-                    line != patent_number and 
-                    not line.isdigit() and
-                    not re.match(r'^\d{4}-\d{2}-\d{2}$', line) and
-                    not re.match(r'^[A-Z]{2,5}$', line)):
+                if len(line) > 15 and line != patent_number and not line.isdigit():
                     title = line
                     break
             
@@ -198,19 +349,21 @@ class DrugDiscoveryPatentAnalyzer:
             assignees = []
             inventors = []
             
-            # Look for dates
-            pub_match = re.search(r'Published (\d{4}-\d{2}-\d{2})', text_content)
+            # Look for dates (interned: thousands of records share a few hundred dates)
+            pub_match = PUBLISHED_DATE_RE.search(text_content)
             if pub_match:
-                pub_date = pub_match.group(1)
+                pub_date = sys.intern(pub_match.group(1))
             
-            filed_match = re.search(r'Filed (\d{4}-\d{2}-\d{2})', text_content)
+            filed_match = FILED_DATE_RE.search(text_content)
             if filed_match:
-                filing_date = filed_match.group(1)
+                filing_date = sys.intern(filed_match.group(1))
             
-            # Look for assignees/companies
+            # Look for assignees/companies (interned, as the same assignees recur across records).
+            # Each line is lower-cased once rather than once per indicator
             for line in lines:
-                if any(indicator in line.lower() for indicator in ['inc', 'corp', 'ltd', 'company', 'university', 'foundation', 'institute']):
-                    assignees.append(line)
+                line_lower = line.lower()
+                if any(indicator in line_lower for indicator in ASSIGNEE_INDICATORS):
+                    assignees.append(sys.intern(line))
                     break
             
             # Basic abstract extraction (from visible text)
@@ -218,11 +371,13 @@ class DrugDiscoveryPatentAnalyzer:
             long_lines = [line for line in lines if len(line) > 50]
             if long_lines:
                 for line in long_lines:
-                    if not any(skip in line.lower() for skip in ['patent', 'filed', 'published', 'priority']):
+                    line_lower = line.lower()
+                    if not any(skip in line_lower for skip in ABSTRACT_SKIP_MARKERS):
                         abstract = line[:500]  # Limit length
                         break
             
-            return {
+            url = PATENT_URL_PREFIX + patent_number
+            patent = {
                 'patent_number': patent_number,
                 'title': title[:200] if title else f"Patent {patent_number}",
                 'abstract': abstract,
@@ -230,13 +385,15 @@ class DrugDiscoveryPatentAnalyzer:
                 'assignees': assignees,
                 'publication_date': pub_date,
                 'filing_date': filing_date,
-                'url': f"https://patents.google.com/patent/{patent_number}",
-                'pdf_link': f"https://patents.google.com/patent/{patent_number}/pdf",
+                'url': url,
+                'pdf_link': url + '/pdf',
                 'page': page_num,
-                'item_index': item_index,
-                'raw_text': text_content,
-                'collection_timestamp': datetime.now().isoformat()
+                'item_index': item_index
             }
+            if self.KEEP_RAW_TEXT:
+                patent['raw_text'] = text_content
+            patent['collection_timestamp'] = datetime.now().isoformat()
+            return patent
             
         except Exception as e:
             return None
@@ -245,32 +402,32 @@ class DrugDiscoveryPatentAnalyzer:
         """Analyze a patent for drug discovery relevance using keyword analysis and AI"""
         text_to_analyze = f"{patent.get('title', '')} {patent.get('abstract', '')}".lower()
         
-        # Calculate relevance scores by category
-        category_scores = {}
-        found_terms = {}
-        
-        for category, keywords in self.drug_discovery_keywords.items():
-            score = 0
-            terms = []
-            for keyword in keywords:
-                if keyword.lower() in text_to_analyze:
-                    score += 1
-                    terms.append(keyword)
-            
-            category_scores[category] = score
-            found_terms[category] = terms
-        
-        # Check for exclusion patterns
+        # Calculate relevance scores by category and check for exclusion patterns in one pass.
+        # Matches arrive in registration order, i.e. grouped by category, so the flat term
+        # list is built alongside the per-category lists instead of flattening them later
+        found_terms = {category: [] for category in self.drug_discovery_keywords}
+        all_found_terms = []
         exclusion_penalty = 0
-        for pattern in self.exclusion_patterns:
-            if pattern.lower() in text_to_analyze:
+        
+        # Records with (almost) no title or abstract cannot match anything, so skip the scan
+        if len(text_to_analyze) < self.min_keyword_length:
+            matches = []
+        else:
+            matches = self.relevance_matcher.find(text_to_analyze)
+        
+        for category, keyword in matches:
+            if category is None:
                 exclusion_penalty += 10
+            else:
+                found_terms[category].append(keyword)
+                all_found_terms.append(keyword)
+        
+        category_scores = {category: len(terms) for category, terms in found_terms.items()}
         
         # Calculate overall relevance score
-        total_keywords_found = sum(category_scores.values())
-        max_possible_score = sum(len(keywords) for keywords in self.drug_discovery_keywords.values())
+        total_keywords_found = len(all_found_terms)
         
-        base_score = (total_keywords_found / max_possible_score) * 100
+        base_score = (total_keywords_found / self.max_possible_score) * 100
         relevance_score = max(0, base_score - exclusion_penalty)
         
         # Determine primary category
@@ -280,10 +437,6 @@ class DrugDiscoveryPatentAnalyzer:
         confidence = min(100, (total_keywords_found * 10) + (50 if patent.get('abstract') else 0))
         
         # Create reasoning
-        all_found_terms = []
-        for terms_list in found_terms.values():
-            all_found_terms.extend(terms_list)
-        
         reasoning = f"Found {total_keywords_found} drug discovery keywords. "
         if all_found_terms:
             reasoning += f"Key terms: {', '.join(all_found_terms[:5])}. "
@@ -296,29 +449,95 @@ class DrugDiscoveryPatentAnalyzer:
             category=primary_category,
             confidence=confidence,
             key_terms=all_found_terms,
-            reasoning=reasoning
+            reasoning=reasoning,
+            terms_by_category=found_terms
         )
     
     def analyze_with_openai(self, patent: Dict[str, Any]) -> Optional[DrugDiscoveryAnalysis]:
         """Enhanced analysis using OpenAI API for better accuracy"""
+        return self.analyze_batch_with_openai([patent])[0]
+    
+    def analyze_batch_with_openai(self, patents: List[Dict[str, Any]]) -> List[Optional[DrugDiscoveryAnalysis]]:
+        """Analyze several patents with a single OpenAI request
+        
+        Returns one analysis per patent, in input order, with None where no analysis
+        is available. Cached results are reused and only the rest are sent.
+        """
+        analyses = [None] * len(patents)
         try:
             import openai
-            import os
             
             api_key = os.getenv('OPENAI_API_KEY')
             if not api_key:
-                return None
+                return analyses
             
-            client = openai.OpenAI(api_key=api_key)
+            cache_keys = [self._openai_cache_key(patent) for patent in patents]
+            results = [self._load_openai_result(cache_key) for cache_key in cache_keys]
+            missing = [i for i, result in enumerate(results) if result is None]
             
-            prompt = f"""
-            Analyze this patent for drug discovery relevance:
+            if missing:
+                client = openai.OpenAI(api_key=api_key)
+                fetched = self._request_openai_analyses(client, [patents[i] for i in missing])
+                for i, result in zip(missing, fetched):
+                    if result is not None:
+                        self._store_openai_result(cache_keys[i], result)
+                        results[i] = result
             
+            for i, result in enumerate(results):
+                if result is not None:
+                    analyses[i] = DrugDiscoveryAnalysis(
+                        relevance_score=float(result.get('relevance_score', 0)),
+                        category=result.get('category', 'unknown'),
+                        confidence=float(result.get('confidence', 0)),
+                        key_terms=result.get('key_terms', []),
+                        reasoning=result.get('reasoning', ''),
+                        terms_by_category={}
+                    )
+            
+        except Exception as e:
+            print(f"⚠️ OpenAI analysis failed: {e}")
+        
+        return analyses
+    
+    def _openai_cache_key(self, patent: Dict[str, Any]) -> str:
+        """Content hash identifying an OpenAI analysis of this patent's title and abstract"""
+        content = f"{self.OPENAI_MODEL}|{patent.get('title', '')}|{patent.get('abstract', '')}"
+        return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+    
+    def _load_openai_result(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached OpenAI result, from memory or from the on-disk cache"""
+        result = self._openai_results.get(cache_key)
+        if result is None:
+            cache_file = self.openai_cache_dir / f"{cache_key}.json"
+            if cache_file.exists():
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    result = json.load(f)
+                self._openai_results[cache_key] = result
+        return result
+    
+    def _store_openai_result(self, cache_key: str, result: Dict[str, Any]):
+        """Keep an OpenAI result in memory and on disk"""
+        self._openai_results[cache_key] = result
+        self.openai_cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.openai_cache_dir / f"{cache_key}.json", 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False)
+    
+    def _request_openai_analyses(self, client, patents: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """Ask OpenAI to analyze a batch of patents and return the parsed result for each"""
+        patent_listing = "\n".join(
+            f"""
+            Patent {index}:
             Title: {patent.get('title', '')}
             Abstract: {patent.get('abstract', '')}
-            Patent Number: {patent.get('patent_number', '')}
+            Patent Number: {patent.get('patent_number', '')}"""
+            for index, patent in enumerate(patents, 1)
+        )
+        
+        prompt = f"""
+            Analyze each of these {len(patents)} patents for drug discovery relevance:
+            {patent_listing}
             
-            Please analyze this patent and provide:
+            For each patent provide:
             1. Drug discovery relevance score (0-100)
             2. Primary category (Target/Compound/Biomarker/Therapeutic/Other)
             3. Confidence level (0-100)
@@ -327,36 +546,25 @@ class DrugDiscoveryPatentAnalyzer:
             
             Focus on: therapeutic targets, drug compounds, biomarkers, treatments, pharmaceutical compositions, and clinical applications.
             
-            Respond in JSON format:
-            {{
-                "relevance_score": <0-100>,
-                "category": "<category>",
-                "confidence": <0-100>,
-                "key_terms": ["term1", "term2"],
-                "reasoning": "<brief explanation>"
-            }}
+            Return one analysis per patent, with patent_index set to the patent's number in this list.
             """
-            
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=300,
-                temperature=0.3
-            )
-            
-            result = json.loads(response.choices[0].message.content)
-            
-            return DrugDiscoveryAnalysis(
-                relevance_score=float(result.get('relevance_score', 0)),
-                category=result.get('category', 'unknown'),
-                confidence=float(result.get('confidence', 0)),
-                key_terms=result.get('key_terms', []),
-                reasoning=result.get('reasoning', '')
-            )
-            
-        except Exception as e:
-            print(f"⚠️ OpenAI analysis failed: {e}")
-            return None
+        
+        # Structured output: the response is guaranteed to match OPENAI_ANALYSES_SCHEMA
+        response = client.chat.completions.create(
+            model=self.OPENAI_MODEL,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=300 * len(patents),
+            temperature=0.3,
+            response_format={
+                "type": "json_schema",
+                "json_schema": {"name": "drug_discovery_analyses", "schema": OPENAI_ANALYSES_SCHEMA, "strict": True}
+            }
+        )
+        
+        content = response.choices[0].message.content
+        analyses = (orjson.loads(content) if ORJSON_AVAILABLE else json.loads(content))['analyses']
+        by_index = {analysis['patent_index']: analysis for analysis in analyses}
+        return [by_index.get(index) for index in range(1, len(patents) + 1)]
     
     def filter_drug_discovery_patents(self, patents: List[Dict[str, Any]], 
                                      min_relevance: float = 30.0) -> List[Dict[str, Any]]:
@@ -365,69 +573,88 @@ class DrugDiscoveryPatentAnalyzer:
         
         drug_discovery_patents = []
         
-        # Analyze patents in parallel for speed
-        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-            future_to_patent = {
-                executor.submit(self._analyze_single_patent, patent): patent 
-                for patent in patents
-            }
+        for i, (patent, ai_analysis) in enumerate(self._iter_openai_analyses(patents)):
+            try:
+                # Fallback to keyword analysis, which runs on this thread
+                analysis = ai_analysis or self.analyze_drug_discovery_relevance(patent)
+                if analysis and analysis.relevance_score >= min_relevance:
+                    patent['drug_discovery_analysis'] = analysis
+                    drug_discovery_patents.append(patent)
+                    
+                    if len(drug_discovery_patents) % 10 == 0:
+                        print(f"   ✅ Found {len(drug_discovery_patents)} relevant patents so far...")
             
-            for i, future in enumerate(concurrent.futures.as_completed(future_to_patent)):
-                patent = future_to_patent[future]
-                try:
-                    analysis = future.result()
-                    if analysis and analysis.relevance_score >= min_relevance:
-                        patent['drug_discovery_analysis'] = analysis
-                        drug_discovery_patents.append(patent)
-                        
-                        if len(drug_discovery_patents) % 10 == 0:
-                            print(f"   ✅ Found {len(drug_discovery_patents)} relevant patents so far...")
-                
-                except Exception as e:
-                    continue
-                
-                if (i + 1) % 100 == 0:
-                    print(f"   📊 Processed {i + 1}/{len(patents)} patents")
+            except Exception as e:
+                continue
+            
+            if (i + 1) % 100 == 0:
+                print(f"   📊 Processed {i + 1}/{len(patents)} patents")
         
         print(f"🎯 Found {len(drug_discovery_patents)} drug discovery relevant patents")
         return drug_discovery_patents
     
-    def _analyze_single_patent(self, patent: Dict[str, Any]) -> Optional[DrugDiscoveryAnalysis]:
-        """Analyze a single patent with fallback methods"""
-        # Try OpenAI analysis first
-        ai_analysis = self.analyze_with_openai(patent)
-        if ai_analysis:
-            return ai_analysis
-        
-        # Fallback to keyword analysis
-        return self.analyze_drug_discovery_relevance(patent)
+    def _iter_openai_analyses(self, patents: List[Dict[str, Any]]):
+        """Yield (patent, OpenAI analysis or None) for every patent
+        
+        Only the OpenAI requests, which spend their time waiting on the network, go
+        to a thread pool. Without an API key there is nothing to wait for, so patents
+        are yielded in order without any pool or futures.
+        """
+        if not os.getenv('OPENAI_API_KEY'):
+            for patent in patents:
+                yield patent, None
+            return
+        
+        # Patents are sent OPENAI_BATCH_SIZE per request
+        batches = [
+            patents[start:start + self.OPENAI_BATCH_SIZE]
+            for start in range(0, len(patents), self.OPENAI_BATCH_SIZE)
+        ]
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
+            future_to_batch = {
+                executor.submit(self.analyze_batch_with_openai, batch): batch
+                for batch in batches
+            }
+            
+            for future in concurrent.futures.as_completed(future_to_batch):
+                yield from zip(future_to_batch[future], future.result())
     
     def _save_patents_checkpoint(self, patents: List[Dict[str, Any]], page_num: int):
         """Save progress checkpoint"""
         checkpoint_file = self.results_dir / f"checkpoint_page_{page_num}.json"
         with open(checkpoint_file, 'w', encoding='utf-8') as f:
-            json.dump(patents, f, indent=2, default=str)
+            f.write(_dumps_indented(patents))
         print(f"   💾 Saved checkpoint: {len(patents)} patents")
     
-    def save_drug_discovery_results(self, patents: List[Dict[str, Any]], filename: str = "foxp2_drug_discovery"):
-        """Save filtered drug discovery patents with analysis"""
+    def save_drug_discovery_results(self, patents: Iterable[Dict[str, Any]], filename: str = "foxp2_drug_discovery"):
+        """Save filtered drug discovery patents with analysis
+        
+        Both files are written in one pass, one patent at a time, so `patents` can be
+        any iterable (a list or a generator) and is never held or encoded as a whole.
+        """
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        # Save detailed JSON
         json_file = self.results_dir / f"{filename}_{timestamp}.json"
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(patents, f, indent=2, default=str)
-        
-        # Save CSV summary
         csv_file = self.results_dir / f"{filename}_summary_{timestamp}.csv"
-        with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
+        
+        with open(json_file, 'w', encoding='utf-8') as json_out, \
+             open(csv_file, 'w', newline='', encoding='utf-8') as csv_out:
+            # Detailed JSON: a list of patents, laid out as a two-space indented dump would be
+            json_out.write('[')
+            
+            # CSV summary
+            writer = csv.writer(csv_out)
             writer.writerow([
                 'Patent Number', 'Title', 'Relevance Score', 'Category', 
                 'Confidence', 'Key Terms', 'Publication Date', 'Assignees', 'URL'
             ])
             
+            written = 0
             for patent in patents:
+                json_out.write(',\n  ' if written else '\n  ')
+                json_out.write(_dumps_indented(patent).replace('\n', '\n  '))
+                
                 analysis = patent.get('drug_discovery_analysis')
                 writer.writerow([
                     patent.get('patent_number', ''),
@@ -440,6 +667,9 @@ class DrugDiscoveryPatentAnalyzer:
                     ', '.join(patent.get('assignees', []))[:100],
                     patent.get('url', '')
                 ])
+                written += 1
+            
+            json_out.write('\n]' if written else ']')
         
         print(f"💾 Saved results to:")
         print(f"   📄 Detailed: {json_file}")
@@ -453,42 +683,38 @@ class DrugDiscoveryPatentAnalyzer:
             return {}
         
         # Category distribution
-        categories = {}
+        categories = Counter()
         relevance_scores = []
-        key_terms_count = {}
-        assignees_count = {}
-        years = {}
+        key_terms_count = Counter()
+        assignees_count = Counter()
+        years = Counter()
         
         for patent in patents:
             analysis = patent.get('drug_discovery_analysis')
             if analysis:
                 # Categories
-                cat = analysis.category
-                categories[cat] = categories.get(cat, 0) + 1
+                categories[analysis.category] += 1
                 relevance_scores.append(analysis.relevance_score)
                 
                 # Key terms
-                for term in analysis.key_terms:
-                    key_terms_count[term] = key_terms_count.get(term, 0) + 1
+                key_terms_count.update(analysis.key_terms)
             
             # Assignees
-            for assignee in patent.get('assignees', []):
-                assignees_count[assignee] = assignees_count.get(assignee, 0) + 1
+            assignees_count.update(patent.get('assignees', []))
             
             # Years
             pub_date = patent.get('publication_date', '')
             if pub_date and len(pub_date) >= 4:
-                year = pub_date[:4]
-                years[year] = years.get(year, 0) + 1
+                years[pub_date[:4]] += 1
         
         summary = {
             'total_patents': len(patents),
             'average_relevance_score': sum(relevance_scores) / len(relevance_scores) if relevance_scores else 0,
-            'category_distribution': dict(sorted(categories.items(), key=lambda x: x[1], reverse=True)),
-            'top_key_terms': dict(sorted(key_terms_count.items(), key=lambda x: x[1], reverse=True)[:20]),
-            'top_assignees': dict(sorted(assignees_count.items(), key=lambda x: x[1], reverse=True)[:10]),
-            'publication_years': dict(sorted(years.items(), key=lambda x: x[0], reverse=True)),
-            'high_relevance_count': len([p for p in patents if p.get('drug_discovery_analysis') and p['drug_discovery_analysis'].relevance_score > 70])
+            'category_distribution': dict(categories.most_common()),
+            'top_key_terms': dict(key_terms_count.most_common(20)),
+            'top_assignees': dict(assignees_count.most_common(10)),
+            'publication_years': dict(sorted(years.items(), reverse=True)),
+            'high_relevance_count': sum(1 for score in relevance_scores if score > 70)
         }
         
         return summary
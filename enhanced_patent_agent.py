@@ -2,19 +2,134 @@ import requests
 import json
 import time
 import os
+import sys
+import shutil
 import re
+import hashlib
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Union
 from dataclasses import dataclass
 import xml.etree.ElementTree as ET
-from urllib.parse import urlencode, quote, urlparse
+from urllib.parse import urlencode, quote, quote_plus, urlparse
 import logging
 from datetime import datetime
 import threading
+import atexit
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import OrderedDict
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
 
 from base_agent import BasePatentAgent, PatentData, PatentDataType, Task
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Scraping backends, imported once here rather than on every search
+try:
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    SELENIUM_AVAILABLE = True
+except ImportError:
+    SELENIUM_AVAILABLE = False
+
+# HTTP/2 client (httpx with the h2 extra) for PDF downloads and patent lookups
+try:
+    import httpx
+    import h2  # noqa: F401 -- required by httpx for HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    from bs4 import BeautifulSoup
+    import soupsieve
+    BS4_AVAILABLE = True
+except ImportError:
+    BS4_AVAILABLE = False
+
+def _loads_json(content: bytes) -> Any:
+    """Parse a UTF-8 JSON document, with orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(content)
+    return json.loads(content)
+
+def _dumps_json(obj: Any) -> bytes:
+    """Encode obj as compact UTF-8 JSON, with orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+# Patterns used on every search result, compiled once.
+# Patent numbers: group 1 is a country-code number (standard format, which also covers
+# the US, EP, CN and JP forms), group 2 a WIPO number
+PATENT_NUMBER_RE = re.compile(r'\b(?:([A-Z]{2}\d{7,10}[A-Z]?\d?)|(WO\d{4}/\d{6}))\b')
+PUBLISHED_DATE_RE = re.compile(r'Published (\d{4}-\d{2}-\d{2})')
+NON_WORD_RE = re.compile(r'[^\w]')
+UNSAFE_FILENAME_RE = re.compile(r'[^\w\-_.]')
+KIND_CODE_RE = re.compile(r'[A-Z]\d?$')
+PATENT_PATH_RE = re.compile(r'/patent/([^/]+)')
+PATENT_HREF_RE = re.compile(r'href="(/patent/([^"]+))"')
+INVENTOR_LABEL_RE = re.compile(r'Inventor', re.I)
+ASSIGNEE_LABEL_RE = re.compile(r'Assignee', re.I)
+
+# Block size for streaming PDF downloads to disk
+DOWNLOAD_BUFFER_SIZE = 1 << 20
+
+# Rendered text of every search result on a Google Patents results page
+RESULT_ITEM_TEXTS_SCRIPT = (
+    "return Array.from(document.querySelectorAll('search-result-item'), item => item.innerText);"
+)
+
+# CSS selectors for patent results in static HTML, most specific first
+PATENT_RESULT_SELECTORS = (
+    'article[data-result]',
+    '.search-result-item',
+    '.patent-result',
+    'div[data-patent-id]',
+    'a[href*="/patent/"]'
+)
+if BS4_AVAILABLE:
+    # Union of all the selectors, plus each one on its own
+    RESULT_SELECTOR_UNION = soupsieve.compile(', '.join(PATENT_RESULT_SELECTORS))
+    RESULT_SELECTOR_PATTERNS = tuple(soupsieve.compile(selector) for selector in PATENT_RESULT_SELECTORS)
+
+class TokenBucket:
+    """Thread-safe token bucket: bursts of up to `capacity` calls, refilled at `rate` per second"""
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.timestamp = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self, cancel_event: Optional[threading.Event] = None):
+        """Take one token, sleeping until it is available
+        
+        The token is reserved under the lock (the balance may go negative) and the
+        wait happens outside it, so concurrent callers queue up at the refill rate.
+        Setting cancel_event cuts the wait short.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.timestamp) * self.rate)
+            self.timestamp = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        
+        if wait > 0:
+            if cancel_event is not None:
+                cancel_event.wait(wait)
+            else:
+                time.sleep(wait)
+
 @dataclass
 class DownloadResult:
     """Result of a PDF download operation"""
@@ -26,7 +141,7 @@ class DownloadResult:
 class EnhancedPatentAgent(BasePatentAgent):
     """Enhanced patent search agent with PDF download capabilities and improved query interface"""
     
-    def __init__(self, agent_id: str = "enhanced_patent_agent_001"):
+    def __init__(self, agent_id: str = "enhanced_patent_agent_001", download_workers: Optional[int] = None):
         super().__init__(
             agent_id=agent_id,
             name="Enhanced Patent Search Agent",
@@ -37,6 +152,17 @@ class EnhancedPatentAgent(BasePatentAgent):
         self.download_dir = Path("patent_data/downloaded_pdfs")
         self.download_dir.mkdir(parents=True, exist_ok=True)
         
+        # Google Patents results are cached on disk by query, so a repeated search
+        # within search_cache_ttl seconds skips the network and browser entirely
+        self.search_cache_dir = Path("patent_data/search_cache")
+        self.search_cache_ttl = 6 * 60 * 60
+        
+        # Patent detail lookups are also kept in memory, least recently used evicted first,
+        # so batch workflows asking for the same patent again skip the API round-trip
+        self.detail_cache = OrderedDict()
+        self.detail_cache_size = 4096
+        self._detail_cache_lock = threading.Lock()
+        
         # API endpoints for patent search and download
         self.apis = {
             'google_patents_web': 'https://patents.google.com',
@@ -49,12 +175,71 @@ class EnhancedPatentAgent(BasePatentAgent):
         # Session for connection pooling
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
+            # Every encoding urllib3 can decode here: adds br / zstd when brotli / zstandard
+            # are installed, which shrinks result and detail pages well below gzip
+            'Accept-Encoding': ', '.join(ACCEPT_ENCODING.split(','))
         })
+        # Keep enough connections alive per host for the concurrent searches and downloads,
+        # and retry idempotent requests on transient errors and throttling; once retries are
+        # exhausted the last response is returned as before rather than raising RetryError
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         
-        # Rate limiting
-        self.last_request_time = {}
+        # With httpx[http2] installed, PDF downloads and patent lookups go over HTTP/2 instead:
+        # concurrent requests to one host are multiplexed on a single connection rather than
+        # each holding its own. Without it they use the session above
+        self.http2_client = None
+        if HTTP2_AVAILABLE:
+            # The pool limits belong on the transport: httpx ignores client-level limits and
+            # http2 once an explicit transport is given
+            self.http2_client = httpx.Client(
+                headers={'User-Agent': self.session.headers['User-Agent']},
+                transport=httpx.HTTPTransport(
+                    http2=True,
+                    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+                    retries=3
+                ),
+                follow_redirects=True
+            )
+            atexit.register(self.http2_client.close)
+        
+        # Rate limiting (shared by the search and download threads): a token bucket per
+        # API allowing short bursts; APIs not listed get one request per min_request_interval
+        self.rate_limits = {
+            'google_patents': (5, 10),  # (requests per second, burst size)
+            'patent_details': (5, 10),
+            'pdf_download': (5, 10)
+        }
         self.min_request_interval = 1.0  # seconds between requests
+        self._rate_buckets = {}
+        self._rate_limit_lock = threading.Lock()
+        
+        # PDF download concurrency: the batch pool size (FOXP2_DOWNLOAD_WORKERS overrides the
+        # default), and per host a ramp that starts at initial_downloads_per_host slots and
+        # gains one per successful download up to max_downloads_per_host, so a host is not
+        # hit with the whole pool before it has shown it serves downloads fine
+        self.download_workers = download_workers or int(os.getenv('FOXP2_DOWNLOAD_WORKERS', '30'))
+        self.initial_downloads_per_host = 4
+        self.max_downloads_per_host = self.download_workers
+        self._host_download_slots = {}
+        self._host_download_permits = {}
+        
+        # Headless Chrome for scraping, started on first use and reused by later searches
+        self._driver = None
+        self._driver_lock = threading.Lock()
+        
+        # Set to cancel a running search: the result-page, source and download loops check it
+        # and stop early, returning what they have so far
+        self.cancel_event = threading.Event()
         
         # Setup API keys
         self.setup_api_keys()
@@ -102,27 +287,45 @@ class EnhancedPatentAgent(BasePatentAgent):
     def _process_search_task(self, search_params: Dict[str, Any]) -> PatentData:
         """Process search task and return PatentData object"""
         results = self.search_patents(search_params)
+        search_time = time.time()
         
         return PatentData(
-            id=f"search_result_{int(time.time())}",
+            id=f"search_result_{int(search_time)}",
             type=PatentDataType.QUERY_RESULT,
             content=results,
             metadata={
-                "search_timestamp": time.time(),
+                "search_timestamp": search_time,
                 "agent_id": self.agent_id
             }
         )
     
     def rate_limit(self, api_name: str):
-        """Implement rate limiting for API calls"""
-        current_time = time.time()
-        if api_name in self.last_request_time:
-            time_since_last = current_time - self.last_request_time[api_name]
-            if time_since_last < self.min_request_interval:
-                sleep_time = self.min_request_interval - time_since_last
-                time.sleep(sleep_time)
-        
-        self.last_request_time[api_name] = time.time()
+        """Implement rate limiting for API calls (thread-safe, one token bucket per API)"""
+        with self._rate_limit_lock:
+            bucket = self._rate_buckets.get(api_name)
+            if bucket is None:
+                rate, capacity = self.rate_limits.get(api_name, (1.0 / self.min_request_interval, 1))
+                bucket = self._rate_buckets[api_name] = TokenBucket(rate, capacity)
+        bucket.acquire(self.cancel_event)
+    
+    def _host_download_slot(self, url: str) -> threading.Semaphore:
+        """Semaphore limiting concurrent downloads from the URL's host"""
+        host = urlparse(url).netloc
+        with self._rate_limit_lock:
+            slot = self._host_download_slots.get(host)
+            if slot is None:
+                permits = min(self.initial_downloads_per_host, self.max_downloads_per_host)
+                slot = self._host_download_slots[host] = threading.Semaphore(permits)
+                self._host_download_permits[host] = permits
+        return slot
+    
+    def _widen_host_download_slot(self, url: str):
+        """Allow one more concurrent download from the URL's host, up to max_downloads_per_host"""
+        host = urlparse(url).netloc
+        with self._rate_limit_lock:
+            if self._host_download_permits[host] < self.max_downloads_per_host:
+                self._host_download_permits[host] += 1
+                self._host_download_slots[host].release()
     
     def search_patents(self, query_params: Dict[str, Any]) -> Dict[str, Any]:
         """Main patent search interface"""
@@ -149,25 +352,37 @@ class EnhancedPatentAgent(BasePatentAgent):
         
         max_results = params.get('max_results', 50)
         include_pdfs = params.get('include_pdfs', True)
+        include_details = params.get('include_details', False)
         
         query = ' '.join(keywords)
         
-        # Search using multiple sources
-        all_results = []
-        
-        # Google Patents search
-        google_results = self._search_google_patents_web(query, max_results // 2)
-        all_results.extend(google_results)
+        # Search using multiple sources (Google Patents, then Espacenet if available).
+        # The sources are queried concurrently, so their network waits overlap; results
+        # are merged and deduplicated in source order, keeping the same precedence.
+        # The primary source is asked for the full max_results and the others for half
+        # each, to top up a short primary result; once the sources merged so far fill
+        # max_results, the later ones are not waited for
+        sources = [self._search_google_patents_web, self._search_espacenet_web]
+        source_limits = [max_results] + [max_results // 2] * (len(sources) - 1)
+        unique_results = []
         
-        # Espacenet search (if available)
-        espacenet_results = self._search_espacenet_web(query, max_results // 2)
-        all_results.extend(espacenet_results)
+        executor = ThreadPoolExecutor(max_workers=len(sources))
+        try:
+            source_futures = [executor.submit(search, query, limit) for search, limit in zip(sources, source_limits)]
+            for future in source_futures:
+                unique_results = self._deduplicate_results(unique_results + future.result())
+                if len(unique_results) >= max_results or self.cancel_event.is_set():
+                    break
+        finally:
+            executor.shutdown(wait=False)
+        unique_results = unique_results[:max_results]
         
-        # Deduplicate and format results
-        unique_results = self._deduplicate_results(all_results)
+        # Fill in abstracts, inventors and assignees the search results lack, if requested
+        if include_details and not self.cancel_event.is_set():
+            self._enhance_patents_batch(unique_results)
         
         # Download PDFs if requested
-        if include_pdfs:
+        if include_pdfs and not self.cancel_event.is_set():
             self._download_patents_batch(unique_results[:10])  # Limit initial downloads
         
         return {
@@ -187,7 +402,7 @@ class EnhancedPatentAgent(BasePatentAgent):
             raise ValueError("Patent number is required")
         
         # Clean patent number
-        clean_patent_number = re.sub(r'[^\w]', '', patent_number.upper())
+        clean_patent_number = NON_WORD_RE.sub('', patent_number.upper())
         
         # Search Google Patents
         patent_data = self._get_patent_details_google(patent_number)
@@ -247,13 +462,50 @@ class EnhancedPatentAgent(BasePatentAgent):
     
     def _search_google_patents_web(self, query: str, max_results: int) -> List[Dict[str, Any]]:
         """Search Google Patents using web interface"""
+        backend = 'searchapi' if self.api_keys['searchapi'] else 'scraping'
+        cache_key = self._search_cache_key(backend, query, max_results)
+        results = self._load_search_results(cache_key)
+        if results is not None:
+            return results
+        
         self.rate_limit('google_patents')
         
         # Use SearchAPI if available, otherwise web scraping
         if self.api_keys['searchapi']:
-            return self._search_with_searchapi(query, max_results)
+            results = self._search_with_searchapi(query, max_results)
         else:
-            return self._search_google_patents_scraping(query, max_results)
+            results = self._search_google_patents_scraping(query, max_results)
+        
+        # Failed searches (no results, or the scraping demo placeholder) are not cached
+        if results and results[0].get('source') != 'demo_scraping_fallback':
+            self._store_search_results(cache_key, results)
+        return results
+    
+    def _search_cache_key(self, backend: str, query: str, max_results: int) -> str:
+        """Hash identifying a search by backend, normalized query and result limit"""
+        content = f"{backend}|{' '.join(query.split()).lower()}|{max_results}"
+        return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+    
+    def _load_search_results(self, cache_key: str) -> Optional[List[Dict[str, Any]]]:
+        """Return cached search results, or None if absent or older than the TTL"""
+        cache_file = self.search_cache_dir / f"{cache_key}.json"
+        try:
+            if time.time() - cache_file.stat().st_mtime > self.search_cache_ttl:
+                return None
+            with open(cache_file, 'rb') as f:
+                return _loads_json(f.read())
+        except (OSError, ValueError):
+            return None
+    
+    def _store_search_results(self, cache_key: str, results: List[Dict[str, Any]]):
+        """Write search results to the on-disk cache"""
+        self.search_cache_dir.mkdir(parents=True, exist_ok=True)
+        cache_file = self.search_cache_dir / f"{cache_key}.json"
+        # Written to a temporary file and renamed, so concurrent readers never see a partial file
+        temp_file = cache_file.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(temp_file, 'wb') as f:
+            f.write(_dumps_json(results))
+        os.replace(temp_file, cache_file)
     
     def _search_with_searchapi(self, query: str, max_results: int) -> List[Dict[str, Any]]:
         """Search using SearchAPI.io service"""
@@ -268,24 +520,22 @@ class EnhancedPatentAgent(BasePatentAgent):
             response = self.session.get(self.apis['google_patents_api'], params=params, timeout=30)
             response.raise_for_status()
             
-            data = response.json()
-            results = []
-            
-            if 'organic_results' in data:
-                for result in data['organic_results']:
-                    patent_info = {
-                        'patent_number': result.get('publication_number', ''),
-                        'title': result.get('title', ''),
-                        'abstract': result.get('snippet', ''),
-                        'inventors': result.get('inventors', []),
-                        'assignees': result.get('assignees', []),
-                        'publication_date': result.get('publication_date', ''),
-                        'filing_date': result.get('filing_date', ''),
-                        'url': result.get('link', ''),
-                        'pdf_link': result.get('pdf', ''),
-                        'source': 'google_patents_api'
-                    }
-                    results.append(patent_info)
+            data = _loads_json(response.content)
+            results = [
+                {
+                    'patent_number': result.get('publication_number', ''),
+                    'title': result.get('title', ''),
+                    'abstract': result.get('snippet', ''),
+                    'inventors': result.get('inventors', []),
+                    'assignees': result.get('assignees', []),
+                    'publication_date': result.get('publication_date', ''),
+                    'filing_date': result.get('filing_date', ''),
+                    'url': result.get('link', ''),
+                    'pdf_link': result.get('pdf', ''),
+                    'source': 'google_patents_api'
+                }
+                for result in data.get('organic_results', ())
+            ]
             
             self.logger.info(f"Found {len(results)} patents via SearchAPI")
             return results
@@ -296,13 +546,14 @@ class EnhancedPatentAgent(BasePatentAgent):
     
     def _search_google_patents_scraping(self, query: str, max_results: int) -> List[Dict[str, Any]]:
         """Enhanced web scraping using Selenium for JavaScript-rendered content"""
+        if not SELENIUM_AVAILABLE:
+            print("⚠️ Selenium not available, falling back to static scraping")
+            return self._static_scraping_fallback(query, max_results)
+        
         try:
             print("🤖 Using Selenium for JavaScript-rendered content...")
             return self._selenium_search(query, max_results)
             
-        except ImportError:
-            print("⚠️ Selenium not available, falling back to static scraping")
-            return self._static_scraping_fallback(query, max_results)
         except Exception as e:
             self.logger.error(f"Selenium scraping error: {e}")
             print(f"❌ Selenium failed: {e}")
@@ -311,22 +562,7 @@ class EnhancedPatentAgent(BasePatentAgent):
     def _selenium_search(self, query: str, max_results: int) -> List[Dict[str, Any]]:
         """Use Selenium with comprehensive pagination to get more results"""
         try:
-            from selenium import webdriver
-            from selenium.webdriver.chrome.options import Options
-            from selenium.webdriver.common.by import By
-            from selenium.webdriver.support.ui import WebDriverWait
-            from urllib.parse import quote_plus
-            
-            # Setup Chrome options
-            chrome_options = Options()
-            chrome_options.add_argument("--headless")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--window-size=1920,1080")
-            chrome_options.add_argument("--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-            
-            driver = webdriver.Chrome(options=chrome_options)
+            driver = self._acquire_driver()
             all_results = []
             seen_patents = set()
             
@@ -341,7 +577,7 @@ class EnhancedPatentAgent(BasePatentAgent):
                 print(f"📊 Target: up to {max_results} results across {max_pages} pages")
                 
                 for page_num in range(1, max_pages + 1):
-                    if len(all_results) >= max_results:
+                    if len(all_results) >= max_results or self.cancel_event.is_set():
                         break
                     
                     # Use discovered pagination parameters
@@ -360,56 +596,44 @@ class EnhancedPatentAgent(BasePatentAgent):
                         print(f"   ⚠️ Timeout on page {page_num}")
                         continue
                     
-                    # Extract results from current page
-                    search_items = driver.find_elements(By.TAG_NAME, 'search-result-item')
-                    print(f"   📊 Found {len(search_items)} items")
+                    # Extract results from current page; all item texts come back from
+                    # one script call instead of one WebDriver round-trip per item
+                    item_texts = driver.execute_script(RESULT_ITEM_TEXTS_SCRIPT)
+                    print(f"   📊 Found {len(item_texts)} items")
                     
+                    # Every record from this page shares one source label string
+                    page_source = f'selenium_comprehensive_p{page_num}'
                     page_results = 0
-                    for i, item in enumerate(search_items):
+                    for i, text_content in enumerate(item_texts):
                         try:
-                            text_content = item.text
-                            
-                            # Extract patent number with expanded patterns
-                            patent_patterns = [
-                                r'\b([A-Z]{2}\d{7,10}[A-Z]?\d?)\b',  # Standard format
-                                r'\b(US\d{7,10}[A-Z]\d?)\b',          # US patents
-                                r'\b(EP\d{7,10}[A-Z]\d?)\b',          # European patents
-                                r'\b(WO\d{4}/\d{6})\b',               # WIPO patents
-                                r'\b(CN\d{9}[A-Z]?)\b',               # Chinese patents
-                                r'\b(JP\d{7,10}[A-Z]?\d?)\b'          # Japanese patents
-                            ]
-                            
+                            # Extract patent number in one scan: the first country-code number
+                            # anywhere in the text wins, otherwise the first WIPO number
                             patent_number = ''
-                            for pattern in patent_patterns:
-                                match = re.search(pattern, text_content)
-                                if match:
+                            for match in PATENT_NUMBER_RE.finditer(text_content):
+                                if match.group(1):
                                     patent_number = match.group(1)
                                     break
+                                patent_number = patent_number or match.group(2)
                             
                             if patent_number and patent_number not in seen_patents:
                                 seen_patents.add(patent_number)
                                 
-                                # Extract title with improved logic
-                                lines = [line.strip() for line in text_content.split('\n') if line.strip()]
-                                title = ''
-                                for line in lines:
-                                    if (len(line) > 15 and 
-                                        line != patent_number and 
-                                        not line.isdigit() and
-                                        not re.match(r'^\d{4}-\d{2}-\d{2}$', line) and
-                                        not re.match(r'^[A-Z]{2,3}$', line)):
-                                        title = line
-                                        break
+                                # Extract title: the first long line that is not the number itself.
+                                # Date lines (10 chars) and country codes (2-3 chars) can never
+                                # pass the length check, so they need no separate test
+                                title = next(
+                                    (line for line in map(str.strip, text_content.split('\n'))
+                                     if len(line) > 15 and line != patent_number and not line.isdigit()),
+                                    f"Patent {patent_number}"
+                                )
                                 
-                                if not title:
-                                    title = f"Patent {patent_number}"
-                                
-                                # Extract publication date
+                                # Extract publication date (interned: results share a few dates)
                                 pub_date = ''
-                                date_match = re.search(r'Published (\d{4}-\d{2}-\d{2})', text_content)
+                                date_match = PUBLISHED_DATE_RE.search(text_content)
                                 if date_match:
-                                    pub_date = date_match.group(1)
+                                    pub_date = sys.intern(date_match.group(1))
                                 
+                                url = f"https://patents.google.com/patent/{patent_number}"
                                 all_results.append({
                                     'patent_number': patent_number,
                                     'title': title[:200],
@@ -418,9 +642,9 @@ class EnhancedPatentAgent(BasePatentAgent):
                                     'assignees': [],
                                     'publication_date': pub_date,
                                     'filing_date': '',
-                                    'url': f"https://patents.google.com/patent/{patent_number}",
-                                    'pdf_link': f"https://patents.google.com/patent/{patent_number}/pdf",
-                                    'source': f'selenium_comprehensive_p{page_num}'
+                                    'url': url,
+                                    'pdf_link': url + '/pdf',
+                                    'source': page_source
                                 })
                                 page_results += 1
                                 
@@ -442,18 +666,57 @@ class EnhancedPatentAgent(BasePatentAgent):
                 print(f"🎯 Comprehensive search complete: {len(all_results)} unique patents")
                 return all_results
                 
+            except Exception:
+                # The browser may be unusable after an error; start a fresh one next time
+                self._discard_driver()
+                raise
             finally:
-                driver.quit()
+                self._driver_lock.release()
                 
         except Exception as e:
             print(f"❌ Selenium comprehensive search error: {e}")
             return []
     
+    def _acquire_driver(self):
+        """Lock the shared Chrome driver for the caller, starting it on first use
+        
+        Chrome takes seconds to start, so one headless browser (with a persistent disk
+        cache) serves every search of this agent. The caller must release _driver_lock.
+        """
+        self._driver_lock.acquire()
+        try:
+            if self._driver is None:
+                # Setup Chrome options
+                chrome_options = Options()
+                chrome_options.add_argument("--headless")
+                chrome_options.add_argument("--no-sandbox")
+                chrome_options.add_argument("--disable-dev-shm-usage")
+                chrome_options.add_argument("--disable-gpu")
+                chrome_options.add_argument("--window-size=1920,1080")
+                chrome_options.add_argument("--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+                chrome_options.add_argument("--enable-features=ZstdContentEncoding")
+                chrome_options.add_argument(f"--disk-cache-dir={Path('patent_data/chrome_cache').resolve()}")
+                
+                self._driver = webdriver.Chrome(options=chrome_options)
+                atexit.register(self._discard_driver)
+            return self._driver
+        except BaseException:
+            self._driver_lock.release()
+            raise
+    
+    def _discard_driver(self):
+        """Quit the shared Chrome driver, if one is running"""
+        driver, self._driver = self._driver, None
+        if driver is not None:
+            atexit.unregister(self._discard_driver)
+            try:
+                driver.quit()
+            except Exception:
+                pass
+    
     def _static_scraping_fallback(self, query: str, max_results: int) -> List[Dict[str, Any]]:
         """Fallback static scraping when Selenium is not available"""
         try:
-            from urllib.parse import quote_plus
-            
             # Simple static request (will not get dynamic content)
             search_url = f"https://patents.google.com/?q={quote_plus(query)}"
             print(f"🌐 Static fallback: {search_url}")
@@ -516,22 +779,27 @@ class EnhancedPatentAgent(BasePatentAgent):
         
         return results
     
+    def _parse_html(self, content: bytes):
+        """Parse an HTML page with BeautifulSoup on the lxml (libxml2) parser
+        
+        The raw response bytes are passed so lxml detects the encoding itself,
+        skipping the separate decode to text.
+        """
+        if not BS4_AVAILABLE:
+            raise ImportError("beautifulsoup4 is required to parse HTML pages")
+        return BeautifulSoup(content, 'lxml')
+    
     def _parse_html_results(self, soup, max_results: int) -> List[Dict[str, Any]]:
         """Parse HTML using BeautifulSoup"""
         results = []
         
         try:
-            # Look for various patent result patterns
-            selectors = [
-                'article[data-result]',
-                '.search-result-item',
-                '.patent-result',
-                'div[data-patent-id]',
-                'a[href*="/patent/"]'
-            ]
+            # Look for various patent result patterns: one walk of the tree collects
+            # candidates for all of them, then each pattern keeps its own matches
+            candidates = RESULT_SELECTOR_UNION.select(soup)
             
-            for selector in selectors:
-                elements = soup.select(selector)
+            for selector, pattern in zip(PATENT_RESULT_SELECTORS, RESULT_SELECTOR_PATTERNS):
+                elements = [element for element in candidates if pattern.match(element)]
                 if elements:
                     print(f"Found {len(elements)} elements with selector: {selector}")
                     
@@ -555,9 +823,9 @@ class EnhancedPatentAgent(BasePatentAgent):
             patent_number = ''
             
             # Look for patent number in various places
-            patent_link = element.find('a', href=re.compile(r'/patent/([^/]+)'))
+            patent_link = element.find('a', href=PATENT_PATH_RE)
             if patent_link:
-                match = re.search(r'/patent/([^/]+)', patent_link['href'])
+                match = PATENT_PATH_RE.search(patent_link['href'])
                 if match:
                     patent_number = match.group(1)
             
@@ -597,13 +865,14 @@ class EnhancedPatentAgent(BasePatentAgent):
         results = []
         
         try:
-            # Look for patent URLs in the HTML
-            patent_url_pattern = r'href="(/patent/([^"]+))"'
-            matches = re.findall(patent_url_pattern, html_content)
-            
+            # Look for patent URLs in the HTML, stopping as soon as enough are found
             seen_patents = set()
-            for link, patent_num in matches:
-                if patent_num not in seen_patents and len(results) < max_results:
+            for match in PATENT_HREF_RE.finditer(html_content):
+                if len(results) >= max_results:
+                    break
+                
+                link, patent_num = match.groups()
+                if patent_num not in seen_patents:
                     seen_patents.add(patent_num)
                     
                     # Try to find title near the link
@@ -643,8 +912,6 @@ class EnhancedPatentAgent(BasePatentAgent):
     def _try_alternative_search(self, query: str, max_results: int) -> List[Dict[str, Any]]:
         """Try alternative search approach"""
         try:
-            from urllib.parse import quote_plus
-            
             # Try the old-style Google Patents URL
             alt_url = f"https://patents.google.com/search?q={quote_plus(query)}&type=PATENT"
             
@@ -655,7 +922,7 @@ class EnhancedPatentAgent(BasePatentAgent):
             response = self.session.get(alt_url, headers=headers, timeout=30)
             if response.status_code == 200:
                 # Parse this response
-                soup = BeautifulSoup(response.text, 'html.parser')
+                soup = self._parse_html(response.content)
                 return self._parse_html_results(soup, max_results)
         
         except Exception as e:
@@ -666,14 +933,14 @@ class EnhancedPatentAgent(BasePatentAgent):
     def _enhance_patent_details(self, patent_info: Dict[str, Any]) -> Dict[str, Any]:
         """Enhance patent information by fetching additional details"""
         try:
-            if not patent_info.get('url'):
+            if not self._needs_enrichment(patent_info) or self.cancel_event.is_set():
                 return patent_info
             
             self.rate_limit('patent_details')
             
             response = self.session.get(patent_info['url'], timeout=20)
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
+                soup = self._parse_html(response.content)
                 
                 # Try to extract more details
                 abstract_elem = soup.find('section', {'data-proto': 'ABSTRACT'})
@@ -681,13 +948,13 @@ class EnhancedPatentAgent(BasePatentAgent):
                     patent_info['abstract'] = abstract_elem.get_text(strip=True)
                 
                 # Try to find inventors
-                inventors_section = soup.find('section', string=re.compile(r'Inventor', re.I))
+                inventors_section = soup.find('section', string=INVENTOR_LABEL_RE)
                 if inventors_section:
                     inventors = [elem.get_text(strip=True) for elem in inventors_section.find_all('span')]
                     patent_info['inventors'] = [inv for inv in inventors if inv]
                 
                 # Try to find assignees
-                assignee_section = soup.find('section', string=re.compile(r'Assignee', re.I))
+                assignee_section = soup.find('section', string=ASSIGNEE_LABEL_RE)
                 if assignee_section:
                     assignees = [elem.get_text(strip=True) for elem in assignee_section.find_all('span')]
                     patent_info['assignees'] = [ass for ass in assignees if ass]
@@ -697,6 +964,46 @@ class EnhancedPatentAgent(BasePatentAgent):
         
         return patent_info
     
+    @staticmethod
+    def _needs_enrichment(patent_info: Dict[str, Any]) -> bool:
+        """Whether the detail page is worth fetching for this patent
+        
+        Results that already carry an abstract, inventors and assignees (as SearchAPI
+        results usually do) have nothing left to fill in, so no request is made.
+        """
+        if not patent_info.get('url'):
+            return False
+        return not (patent_info.get('abstract') and patent_info.get('inventors') and patent_info.get('assignees'))
+    
+    def _enhance_patents_batch(self, patents: List[Dict[str, Any]], max_workers: int = 8) -> List[Dict[str, Any]]:
+        """Enhance several patents concurrently, returning them in input order
+        
+        With SearchAPI configured, missing fields are first filled from batched detail
+        lookups (one query per 20 patents). Patents still incomplete have their detail
+        page fetched on a worker thread through the shared pooled session, so page
+        downloads overlap on kept-alive connections; request starts are still spaced by
+        the 'patent_details' rate limit.
+        """
+        pending = [patent for patent in patents if self._needs_enrichment(patent)]
+        if pending and self.api_keys['searchapi']:
+            details = self._get_patent_details_batch(
+                [patent['patent_number'] for patent in pending if patent.get('patent_number')]
+            )
+            for patent in pending:
+                found = details.get(patent.get('patent_number'))
+                if found:
+                    for field in ('abstract', 'inventors', 'assignees', 'publication_date', 'filing_date', 'pdf_link'):
+                        if not patent.get(field) and found.get(field):
+                            patent[field] = found[field]
+            pending = [patent for patent in pending if self._needs_enrichment(patent)]
+        
+        if pending:
+            # Patents are enhanced in place, so the input list already holds the results
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as executor:
+                list(executor.map(self._enhance_patent_details, pending))
+        
+        return list(patents)
+    
     def _create_demo_result(self, query: str) -> List[Dict[str, Any]]:
         """Create a demo result when scraping fails"""
         return [{
@@ -721,6 +1028,10 @@ class EnhancedPatentAgent(BasePatentAgent):
     def _get_patent_details_google(self, patent_number: str) -> Optional[Dict[str, Any]]:
         """Get detailed patent information from Google Patents"""
         if self.api_keys['searchapi']:
+            details = self._cached_patent_details(patent_number)
+            if details is not None:
+                return details
+            
             params = {
                 'engine': 'google_patents',
                 'q': patent_number,
@@ -729,32 +1040,130 @@ class EnhancedPatentAgent(BasePatentAgent):
             
             try:
                 self.rate_limit('google_patents')
-                response = self.session.get(self.apis['google_patents_api'], params=params, timeout=30)
+                client = self.http2_client or self.session
+                response = client.get(self.apis['google_patents_api'], params=params, timeout=30)
                 response.raise_for_status()
                 
-                data = response.json()
+                data = _loads_json(response.content)
                 
                 if 'organic_results' in data and data['organic_results']:
-                    result = data['organic_results'][0]
-                    
-                    return {
-                        'patent_number': result.get('publication_number', patent_number),
-                        'title': result.get('title', ''),
-                        'abstract': result.get('snippet', ''),
-                        'inventors': result.get('inventors', []),
-                        'assignees': result.get('assignees', []),
-                        'publication_date': result.get('publication_date', ''),
-                        'filing_date': result.get('filing_date', ''),
-                        'url': result.get('link', ''),
-                        'pdf_link': result.get('pdf', ''),
-                        'source': 'google_patents_detail'
-                    }
+                    details = self._patent_details_from_result(data['organic_results'][0], patent_number)
+                    self._cache_patent_details(patent_number, details)
+                    return dict(details)
                 
             except Exception as e:
                 self.logger.error(f"Patent details error: {e}")
         
         return None
     
+    def _get_patent_details_batch(self, patent_numbers: List[str], batch_size: int = 20,
+                                  max_workers: int = 8) -> Dict[str, Dict[str, Any]]:
+        """Get details for many patents, keyed by the requested patent number
+        
+        Cached patents are answered from the cache. The rest are looked up batch_size at
+        a time, one OR-joined SearchAPI query per batch with the batches run concurrently,
+        so a large enrichment pass costs a few round-trips instead of one per patent.
+        Patents no batch query returns are left out of the result.
+        """
+        details = {}
+        if not self.api_keys['searchapi']:
+            return details
+        
+        pending = []
+        for patent_number in dict.fromkeys(patent_numbers):
+            cached = self._cached_patent_details(patent_number)
+            if cached is not None:
+                details[patent_number] = cached
+            else:
+                pending.append(patent_number)
+        
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        if batches:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as executor:
+                for batch_details in executor.map(self._fetch_patent_details_batch, batches):
+                    details.update(batch_details)
+        
+        return details
+    
+    def _fetch_patent_details_batch(self, patent_numbers: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Look up several patents with one SearchAPI query, keyed by requested number"""
+        if self.cancel_event.is_set():
+            return {}
+        
+        params = {
+            'engine': 'google_patents',
+            'q': ' OR '.join(patent_numbers),
+            'num': max(10, len(patent_numbers)),
+            'api_key': self.api_keys['searchapi']
+        }
+        
+        try:
+            self.rate_limit('google_patents')
+            client = self.http2_client or self.session
+            response = client.get(self.apis['google_patents_api'], params=params, timeout=30)
+            response.raise_for_status()
+            
+            data = _loads_json(response.content)
+        except Exception as e:
+            self.logger.error(f"Patent details batch error: {e}")
+            return {}
+        
+        # Results carry full publication numbers (with kind code, e.g. US10123456B2), which
+        # may be more specific than the requested numbers
+        requested = {NON_WORD_RE.sub('', patent_number.upper()): patent_number for patent_number in patent_numbers}
+        found = {}
+        for result in data.get('organic_results', ()):
+            key = NON_WORD_RE.sub('', result.get('publication_number', '').upper())
+            patent_number = requested.get(key) or requested.get(KIND_CODE_RE.sub('', key))
+            if patent_number and patent_number not in found:
+                patent_details = self._patent_details_from_result(result, patent_number)
+                self._cache_patent_details(patent_number, patent_details)
+                found[patent_number] = dict(patent_details)
+        
+        return found
+    
+    def _patent_details_from_result(self, result: Dict[str, Any], patent_number: str) -> Dict[str, Any]:
+        """Patent details from one SearchAPI organic result"""
+        return {
+            'patent_number': result.get('publication_number', patent_number),
+            'title': result.get('title', ''),
+            'abstract': result.get('snippet', ''),
+            'inventors': result.get('inventors', []),
+            'assignees': result.get('assignees', []),
+            'publication_date': result.get('publication_date', ''),
+            'filing_date': result.get('filing_date', ''),
+            'url': result.get('link', ''),
+            'pdf_link': result.get('pdf', ''),
+            'source': 'google_patents_detail'
+        }
+    
+    def _cache_patent_details(self, patent_number: str, details: Dict[str, Any]):
+        """Keep looked-up details in memory and in the on-disk cache"""
+        self._remember_patent_details(patent_number, details)
+        self._store_search_results(self._search_cache_key('patent_details', patent_number, 1), [details])
+    
+    def _cached_patent_details(self, patent_number: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of earlier looked-up details, from memory or the on-disk cache"""
+        with self._detail_cache_lock:
+            details = self.detail_cache.get(patent_number)
+            if details is not None:
+                self.detail_cache.move_to_end(patent_number)
+                return dict(details)
+        
+        cached = self._load_search_results(self._search_cache_key('patent_details', patent_number, 1))
+        if not cached:
+            return None
+        self._remember_patent_details(patent_number, cached[0])
+        return dict(cached[0])
+    
+    def _remember_patent_details(self, patent_number: str, details: Dict[str, Any]):
+        """Add details to the in-memory cache, evicting the least recently used entry when full"""
+        with self._detail_cache_lock:
+            self.detail_cache[patent_number] = details
+            self.detail_cache.move_to_end(patent_number)
+            if len(self.detail_cache) > self.detail_cache_size:
+                self.detail_cache.popitem(last=False)
+    
     def download_patent_pdf(self, patent_data: Dict[str, Any]) -> DownloadResult:
         """Download PDF for a single patent"""
         patent_number = patent_data.get('patent_number', '')
@@ -763,17 +1172,22 @@ class EnhancedPatentAgent(BasePatentAgent):
         if not patent_number:
             return DownloadResult(False, error_message="No patent number provided")
         
+        if self.cancel_event.is_set():
+            return DownloadResult(False, error_message="Download cancelled")
+        
         # Clean filename
-        safe_filename = re.sub(r'[^\w\-_.]', '_', patent_number)
+        safe_filename = UNSAFE_FILENAME_RE.sub('_', patent_number)
         file_path = self.download_dir / f"{safe_filename}.pdf"
         
-        # Check if file already exists
-        if file_path.exists():
+        # Check if file already exists (one stat gives both the answer and the size)
+        try:
             return DownloadResult(
                 True, 
                 str(file_path), 
                 file_size=file_path.stat().st_size
             )
+        except OSError:
+            pass
         
         # Try to download from provided PDF link
         if pdf_link:
@@ -785,6 +1199,9 @@ class EnhancedPatentAgent(BasePatentAgent):
                     file_size=file_path.stat().st_size
                 )
         
+        if self.cancel_event.is_set():
+            return DownloadResult(False, error_message="Download cancelled")
+        
         # Try to construct Google Patents PDF URL
         google_pdf_url = f"https://patents.google.com/patent/{patent_number}/pdf"
         success = self._download_pdf_from_url(google_pdf_url, file_path)
@@ -803,43 +1220,85 @@ class EnhancedPatentAgent(BasePatentAgent):
     
     def _download_pdf_from_url(self, url: str, file_path: Path) -> bool:
         """Download PDF from URL"""
+        slot = self._host_download_slot(url)
+        slot.acquire()
         try:
             self.rate_limit('pdf_download')
+            if self.cancel_event.is_set():  # cancelled while waiting for a slot or token
+                return False
             
-            response = self.session.get(url, timeout=60, stream=True)
-            response.raise_for_status()
-            
-            # Check if response is actually a PDF
-            content_type = response.headers.get('content-type', '').lower()
-            if 'pdf' not in content_type and 'application/pdf' not in content_type:
-                # Check first few bytes for PDF signature
-                first_chunk = next(response.iter_content(chunk_size=8192))
-                if not first_chunk.startswith(b'%PDF'):
-                    self.logger.warning(f"URL {url} does not return PDF content")
-                    return False
-                
-                # Write first chunk
-                with open(file_path, 'wb') as f:
-                    f.write(first_chunk)
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
+            if self.http2_client is not None:
+                downloaded = self._download_pdf_http2(url, file_path)
             else:
-                with open(file_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
+                downloaded = self._download_pdf_requests(url, file_path)
             
-            self.logger.info(f"Downloaded PDF: {file_path}")
-            return True
+            if downloaded:
+                self._widen_host_download_slot(url)
+            return downloaded
             
         except Exception as e:
             self.logger.error(f"PDF download error for {url}: {e}")
             if file_path.exists():
                 file_path.unlink()  # Remove partial file
             return False
+        finally:
+            slot.release()
+    
+    def _download_pdf_requests(self, url: str, file_path: Path) -> bool:
+        """Stream a PDF to disk over the requests session"""
+        # The response is streamed to disk in large blocks, so memory stays flat whatever
+        # the PDF size; leaving the block closes it and returns the connection to the pool.
+        # (A kernel-side os.sendfile/splice copy does not apply: TLS and content decoding
+        # happen in user space, and sendfile cannot read from a socket.)
+        with self.session.get(url, timeout=60, stream=True) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True  # undo any gzip/deflate transfer encoding
+            
+            # Check if response is actually a PDF: by content type, else by the PDF signature
+            content_type = response.headers.get('content-type', '').lower()
+            first_chunk = response.raw.read(8192)
+            if 'pdf' not in content_type and not first_chunk.startswith(b'%PDF'):
+                self.logger.warning(f"URL {url} does not return PDF content")
+                return False
+            
+            with open(file_path, 'wb') as f:
+                f.write(first_chunk)
+                shutil.copyfileobj(response.raw, f, DOWNLOAD_BUFFER_SIZE)
+        
+        self.logger.info(f"Downloaded PDF: {file_path}")
+        return True
     
-    def _download_patents_batch(self, patents: List[Dict[str, Any]], max_workers: int = 3):
-        """Download PDFs for multiple patents in parallel"""
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    def _download_pdf_http2(self, url: str, file_path: Path) -> bool:
+        """Stream a PDF to disk over the HTTP/2 client, with the same PDF check as the session"""
+        with self.http2_client.stream('GET', url, timeout=60) as response:
+            response.raise_for_status()
+            chunks = response.iter_bytes(DOWNLOAD_BUFFER_SIZE)  # decoded, like raw.decode_content
+            
+            # Check if response is actually a PDF
+            content_type = response.headers.get('content-type', '').lower()
+            first_chunk = next(chunks, b'')
+            if 'pdf' not in content_type and not first_chunk.startswith(b'%PDF'):
+                self.logger.warning(f"URL {url} does not return PDF content")
+                return False
+            
+            # Buffered writes only copy into the page cache and the kernel writes them back
+            # in the background, so the loop is bound by the network, not by disk syscalls
+            with open(file_path, 'wb') as f:
+                f.write(first_chunk)
+                f.writelines(chunks)
+        
+        self.logger.info(f"Downloaded PDF: {file_path}")
+        return True
+    
+    def _download_patents_batch(self, patents: List[Dict[str, Any]], max_workers: Optional[int] = None):
+        """Download PDFs for multiple patents in parallel (download_workers threads by default)"""
+        if not patents:
+            return
+        
+        max_workers = max_workers or self.download_workers
+        # Downloads are network-bound, so threads overlap their waits; per-host
+        # concurrency is capped separately in _download_pdf_from_url
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(patents))) as executor:
             download_tasks = {
                 executor.submit(self.download_patent_pdf, patent): patent 
                 for patent in patents
@@ -857,23 +1316,25 @@ class EnhancedPatentAgent(BasePatentAgent):
                     )
     
     def _deduplicate_results(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Remove duplicate patents from results"""
-        seen_patents = set()
-        unique_results = []
+        """Remove duplicate patents from results
+        
+        The first result for each normalized patent number is kept, in input order
+        (dicts preserve insertion order); results without a patent number are dropped.
+        """
+        unique_results = {}
         
         for result in results:
             patent_key = result.get('patent_number', '').strip().upper()
-            if patent_key and patent_key not in seen_patents:
-                seen_patents.add(patent_key)
-                unique_results.append(result)
+            if patent_key:
+                unique_results.setdefault(patent_key, result)
         
-        return unique_results
+        return list(unique_results.values())
     
     def get_download_status(self) -> Dict[str, Any]:
         """Get status of downloaded patents"""
-        pdf_files = list(self.download_dir.glob("*.pdf"))
+        pdf_files = self._scan_pdf_files()
         
-        total_size = sum(f.stat().st_size for f in pdf_files)
+        total_size = sum(stat.st_size for _, stat in pdf_files)
         
         return {
             'download_directory': str(self.download_dir),
@@ -881,14 +1342,23 @@ class EnhancedPatentAgent(BasePatentAgent):
             'total_size_mb': round(total_size / (1024 * 1024), 2),
             'files': [
                 {
-                    'name': f.name,
-                    'size_kb': round(f.stat().st_size / 1024, 2),
-                    'modified': datetime.fromtimestamp(f.stat().st_mtime).isoformat()
+                    'name': entry.name,
+                    'size_kb': round(stat.st_size / 1024, 2),
+                    'modified': datetime.fromtimestamp(stat.st_mtime).isoformat()
                 }
-                for f in sorted(pdf_files, key=lambda x: x.stat().st_mtime, reverse=True)
+                for entry, stat in sorted(pdf_files, key=lambda item: item[1].st_mtime, reverse=True)
             ]
         }
     
+    def _scan_pdf_files(self) -> List[tuple]:
+        """(DirEntry, stat) for every PDF in the download directory
+        
+        One scandir pass with a single stat per file, instead of globbing and then
+        stat-ing each path again for every field that is read.
+        """
+        with os.scandir(self.download_dir) as entries:
+            return [(entry, entry.stat()) for entry in entries if entry.name.endswith('.pdf')]
+    
     def cleanup_downloads(self, older_than_days: int = 30) -> Dict[str, Any]:
         """Clean up old downloaded files"""
         cutoff_time = time.time() - (older_than_days * 24 * 60 * 60)
@@ -896,12 +1366,11 @@ class EnhancedPatentAgent(BasePatentAgent):
         removed_files = []
         total_size_removed = 0
         
-        for pdf_file in self.download_dir.glob("*.pdf"):
-            if pdf_file.stat().st_mtime < cutoff_time:
-                size = pdf_file.stat().st_size
-                pdf_file.unlink()
-                removed_files.append(pdf_file.name)
-                total_size_removed += size
+        for entry, stat in self._scan_pdf_files():
+            if stat.st_mtime < cutoff_time:
+                os.unlink(entry.path)
+                removed_files.append(entry.name)
+                total_size_removed += stat.st_size
         
         return {
             'removed_files': len(removed_files),
@@ -914,6 +1383,58 @@ def create_agent() -> EnhancedPatentAgent:
     """Create and return a new enhanced patent agent"""
     return EnhancedPatentAgent()
 
+# Set when the last interactive search thread has finished
+_search_finished = None
+
+def _run_with_progress(agent: EnhancedPatentAgent, message: str, params: Dict[str, Any]):
+    """Run a search on a worker thread, showing a live elapsed-time counter until it returns
+    
+    Ctrl-C sets the agent's cancel_event and waits for the search to stop at its next
+    check, returning None; a second Ctrl-C stops waiting. The worker is a daemon thread,
+    so quitting never blocks on a search that is still winding down.
+    """
+    global _search_finished
+    
+    # A search left winding down must stop before the next one starts and clears the event
+    if _search_finished is not None and not _search_finished.is_set():
+        print("⏳ Waiting for the cancelled search to stop...")
+        _search_finished.wait()
+    agent.cancel_event.clear()
+    
+    # Completion is signalled with an Event rather than Thread.join, which Ctrl-C can
+    # interrupt in a way that makes the thread look finished when it is not
+    finished = _search_finished = threading.Event()
+    outcome = {}
+    
+    def run_search():
+        try:
+            outcome['result'] = agent.search_patents(params)
+        except Exception as e:
+            outcome['error'] = e
+        finally:
+            finished.set()
+    
+    threading.Thread(target=run_search, daemon=True).start()
+    
+    start_time = time.time()
+    try:
+        while not finished.wait(0.5):
+            print(f"\r{message} {time.time() - start_time:.0f}s", end="", flush=True)
+    except KeyboardInterrupt:
+        agent.cancel_event.set()
+        print("\n⏹️ Cancelling (Ctrl-C again to stop waiting)...")
+        try:
+            finished.wait()
+            print("⏹️ Search cancelled")
+        except KeyboardInterrupt:
+            print("\n⏹️ Stopped waiting; the search will stop in the background")
+        return None
+    
+    print()
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome['result']
+
 def interactive_search():
     """Interactive command-line interface for patent searching"""
     agent = create_agent()
@@ -941,16 +1462,20 @@ def interactive_search():
                 keywords = input("Enter search keywords (space-separated): ").strip()
                 max_results = int(input("Max results (default 20): ") or "20")
                 include_pdfs = input("Download PDFs? (y/n, default y): ").strip().lower() != 'n'
+                include_details = input("Fetch full details (abstract, inventors)? (y/n, default n): ").strip().lower() == 'y'
                 
                 params = {
                     'search_type': 'keywords',
                     'keywords': keywords.split(),
                     'max_results': max_results,
-                    'include_pdfs': include_pdfs
+                    'include_pdfs': include_pdfs,
+                    'include_details': include_details
                 }
                 
-                print("\n🔍 Searching...")
-                results = agent.search_patents(params)
+                print()
+                results = _run_with_progress(agent, "🔍 Searching...", params)
+                if results is None:
+                    continue
                 print(f"Found {results['total_results']} patents")
                 
                 for i, patent in enumerate(results['patents'][:5], 1):
@@ -973,8 +1498,10 @@ def interactive_search():
                     'include_pdf': include_pdf
                 }
                 
-                print("\n🔍 Looking up patent...")
-                result = agent.search_patents(params)
+                print()
+                result = _run_with_progress(agent, "🔍 Looking up patent...", params)
+                if result is None:
+                    continue
                 
                 if result['patent_data']:
                     patent = result['patent_data']
@@ -7,17 +7,39 @@ import time
 import re
 import json
 import csv
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 from urllib.parse import quote_plus
 from pathlib import Path
 from datetime import datetime
 import concurrent.futures
 from dataclasses import dataclass
 from drug_discovery_analyzer import DrugDiscoveryPatentAnalyzer, DrugDiscoveryAnalysis
+from keyword_matcher import KeywordMatcher, shared_matcher
+
+# Per-process analyzer used by score_batch worker processes
+_worker_analyzer = None
+
+def _init_score_worker(analyzer):
+    """Install the caller's analyzer (pickled once per worker process) for scoring"""
+    global _worker_analyzer
+    _worker_analyzer = analyzer
+
+def _score_one(patent: Dict[str, Any]) -> DrugDiscoveryAnalysis:
+    """Score a single patent with the worker process analyzer"""
+    return _worker_analyzer.analyze_drug_discovery_relevance(patent)
+
+def _score_one_or_none(patent: Dict[str, Any]) -> Optional[DrugDiscoveryAnalysis]:
+    """Score a single patent with the worker process analyzer, or None if it fails"""
+    try:
+        return _worker_analyzer.analyze_drug_discovery_relevance(patent)
+    except Exception:
+        return None
 
 class ImprovedDrugDiscoveryAnalyzer(DrugDiscoveryPatentAnalyzer):
     """Enhanced analyzer with improved scoring and content extraction"""
     
+    KEEP_RAW_TEXT = True  # raw text is scored alongside title and abstract
+    
     def __init__(self):
         super().__init__()
         
@@ -83,9 +105,62 @@ class ImprovedDrugDiscoveryAnalyzer(DrugDiscoveryPatentAnalyzer):
             'diseases': 1.2,
             'mechanisms': 1.0
         }
+        
+        # Matchers over every (category, keyword) pair and exclusion pattern, reused for all patents
+        # and shared with any other analyzer built from the same tables in this process
+        self.keyword_entries = [
+            (keyword, (category, keyword))
+            for category, keywords in self.drug_discovery_keywords.items()
+            for keyword in keywords
+        ]
+        self.keyword_matcher = shared_matcher(self.keyword_entries)
+        self.exclusion_matcher = shared_matcher((pattern, pattern) for pattern in self.exclusion_patterns)
+        
+        # Display label for every keyword hit, formatted once
+        self.keyword_labels = {
+            (category, keyword): f"{keyword} ({category})"
+            for category, keywords in self.drug_discovery_keywords.items()
+            for keyword in keywords
+        }
+        
+        # Resolved weight per keyword category (unlisted categories weigh 1.0)
+        self.category_weight_table = {
+            category: self.category_weights.get(category, 1.0)
+            for category in self.drug_discovery_keywords
+        }
+        
+        # Max possible score (assuming every keyword matches in the title) only depends on the keyword tables
+        self.max_possible_score = sum(
+            len(keywords) * 3.0 * self.category_weight_table[category]
+            for category, keywords in self.drug_discovery_keywords.items()
+        )
+        
+        # Keyword matchers extended with caller-supplied extra terms, keyed by those terms
+        self._fused_matchers: Dict[Tuple[str, ...], KeywordMatcher] = {}
     
     def analyze_drug_discovery_relevance(self, patent: Dict[str, Any]) -> DrugDiscoveryAnalysis:
         """Enhanced analysis with improved scoring"""
+        return self.scan_all(patent)[0]
+    
+    def _get_fused_matcher(self, extra_terms: Tuple[str, ...]) -> KeywordMatcher:
+        """Keyword matcher that also reports extra terms, tagged with a None category"""
+        if not extra_terms:
+            return self.keyword_matcher
+        
+        matcher = self._fused_matchers.get(extra_terms)
+        if matcher is None:
+            matcher = KeywordMatcher(self.keyword_entries + [(term, (None, term)) for term in extra_terms])
+            self._fused_matchers[extra_terms] = matcher
+        return matcher
+    
+    def scan_all(self, patent: Dict[str, Any],
+                 extra_terms: Sequence[str] = ()) -> Tuple[DrugDiscoveryAnalysis, List[str]]:
+        """Analyze a patent and, in the same pass over its text, find any extra terms
+        
+        Returns the analysis and the extra terms present in the title, abstract or
+        raw text, in the order they were given.
+        """
+        matcher = self._get_fused_matcher(tuple(extra_terms))
         
         # Combine title, abstract, and available text
         title = patent.get('title', '').lower()
@@ -100,40 +175,26 @@ class ImprovedDrugDiscoveryAnalyzer(DrugDiscoveryPatentAnalyzer):
         ]
         
         # Calculate weighted scores by category
-        category_scores = {}
-        found_terms = {}
-        total_weighted_score = 0
+        category_scores = {category: 0 for category in self.drug_discovery_keywords}
+        found_terms = {category: [] for category in self.drug_discovery_keywords}
+        extra_hits = set()
         
-        for category, keywords in self.drug_discovery_keywords.items():
-            score = 0
-            terms = []
-            
-            for text, weight in text_sources:
-                for keyword in keywords:
-                    if keyword.lower() in text:
-                        score += weight
-                        if keyword not in terms:
-                            terms.append(keyword)
-            
-            # Apply category weight
-            weighted_score = score * self.category_weights.get(category, 1.0)
-            category_scores[category] = weighted_score
-            found_terms[category] = terms
-            total_weighted_score += weighted_score
+        for text, weight in text_sources:
+            for category, keyword in matcher.find(text):
+                if category is None:
+                    extra_hits.add(keyword)
+                    continue
+                category_scores[category] += weight
+                if keyword not in found_terms[category]:
+                    found_terms[category].append(keyword)
+        
+        category_scores, total_weighted_score = self._score_core(category_scores)
         
         # Check for exclusion patterns (reduced penalty)
-        exclusion_penalty = 0
-        full_text = f"{title} {abstract} {raw_text}"
-        for pattern in self.exclusion_patterns:
-            if pattern.lower() in full_text:
-                exclusion_penalty += 5  # Reduced from 10
+        exclusion_penalty = 5 * len(self.exclusion_matcher.find(title, abstract, raw_text))  # Reduced from 10
         
         # Calculate relevance score (0-100 scale)
-        # Max possible score calculation
-        max_possible = sum(
-            len(keywords) * 3.0 * self.category_weights.get(category, 1.0)  # Assuming title matches
-            for category, keywords in self.drug_discovery_keywords.items()
-        )
+        max_possible = self.max_possible_score
         
         base_score = (total_weighted_score / max_possible) * 100 if max_possible > 0 else 0
         relevance_score = max(0, base_score - exclusion_penalty)
@@ -158,13 +219,52 @@ class ImprovedDrugDiscoveryAnalyzer(DrugDiscoveryPatentAnalyzer):
             reasoning += f"Applied {exclusion_penalty} point penalty. "
         reasoning += f"Primary focus: {primary_category}."
         
-        return DrugDiscoveryAnalysis(
+        analysis = DrugDiscoveryAnalysis(
             relevance_score=relevance_score,
             category=primary_category,
             confidence=confidence,
             key_terms=all_found_terms[:10],  # Limit to top 10
-            reasoning=reasoning
+            reasoning=reasoning,
+            terms_by_category=found_terms
         )
+        return analysis, [term for term in extra_terms if term in extra_hits]
+    
+    def _score_core(self, raw_scores: Dict[str, float]) -> Tuple[Dict[str, float], float]:
+        """Apply category weights to per-category hit scores, returning weighted scores and their total"""
+        weighted_scores = {}
+        total_weighted_score = 0
+        
+        for category, score in raw_scores.items():
+            weighted_score = score * self.category_weight_table[category]
+            weighted_scores[category] = weighted_score
+            total_weighted_score += weighted_score
+        
+        return weighted_scores, total_weighted_score
+    
+    def score_batch(self, patents: List[Dict[str, Any]], parallel_threshold: int = 32,
+                    skip_errors: bool = False) -> List[Optional[DrugDiscoveryAnalysis]]:
+        """Analyze several patents at once, returning analyses in input order
+        
+        Batches larger than `parallel_threshold` are spread over a process pool;
+        smaller ones are scored inline since pool start-up would dominate.
+        With `skip_errors`, a patent that fails to analyze yields None instead
+        of aborting the whole batch.
+        """
+        if len(patents) <= parallel_threshold:
+            analyses = []
+            for patent in patents:
+                try:
+                    analyses.append(self.analyze_drug_discovery_relevance(patent))
+                except Exception:
+                    if not skip_errors:
+                        raise
+                    analyses.append(None)
+            return analyses
+        
+        score = _score_one_or_none if skip_errors else _score_one
+        with concurrent.futures.ProcessPoolExecutor(initializer=_init_score_worker,
+                                                    initargs=(self,)) as executor:
+            return list(executor.map(score, patents, chunksize=16))
     
     def extract_enhanced_patent_content(self, patent_number: str) -> Dict[str, Any]:
         """Extract detailed content from individual patent page"""
@@ -286,22 +386,22 @@ class ImprovedDrugDiscoveryAnalyzer(DrugDiscoveryPatentAnalyzer):
         
         print(f"\n🔬 Enhanced analysis of {len(patents)} patents (min relevance: {min_relevance})...")
         
-        # First pass: analyze with existing content
+        # First pass: analyze with existing content (spread over worker processes for
+        # large batches); patents that fail to analyze are skipped
         analyzed_patents = []
+        analyses = self.score_batch(patents, skip_errors=True)
         
-        for i, patent in enumerate(patents):
-            try:
-                analysis = self.analyze_drug_discovery_relevance(patent)
-                patent['drug_discovery_analysis'] = analysis
-                
-                if analysis.relevance_score >= min_relevance:
-                    analyzed_patents.append(patent)
-                
-                if (i + 1) % 50 == 0:
-                    print(f"   📊 Processed {i + 1}/{len(patents)} patents, found {len(analyzed_patents)} relevant")
-                    
-            except Exception as e:
+        for i, (patent, analysis) in enumerate(zip(patents, analyses)):
+            if analysis is None:
                 continue
+            
+            patent['drug_discovery_analysis'] = analysis
+            
+            if analysis.relevance_score >= min_relevance:
+                analyzed_patents.append(patent)
+            
+            if (i + 1) % 50 == 0:
+                print(f"   📊 Processed {i + 1}/{len(patents)} patents, found {len(analyzed_patents)} relevant")
         
         print(f"✅ First pass complete: {len(analyzed_patents)} potentially relevant patents")
         
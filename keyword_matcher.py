@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Multi-pattern keyword matching shared by the keyword-based patent analyzers
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+
+class KeywordMatcher:
+    """Finds which of a fixed set of keywords occur in a text.
+
+    Keywords are registered once as ``(keyword, payload)`` pairs. Matching is
+    plain substring containment on lower-cased text, i.e. the same semantics as
+    ``keyword.lower() in text``, and every matched entry is reported once in
+    registration order. With pyahocorasick installed the whole keyword set is
+    scanned in a single pass over the text; otherwise keywords are grouped by
+    a short shared prefix so a whole group is skipped when its prefix is absent.
+    """
+
+    PREFIX_LENGTH = 4
+
+    def __init__(self, entries: Iterable[Tuple[str, Any]]):
+        keywords: List[str] = []
+        payloads: List[Any] = []
+        positions: Dict[str, List[int]] = {}
+
+        # Keywords are lower-cased and deduplicated here once, so matching never
+        # normalizes them again; each distinct keyword maps to all entries sharing it
+        for keyword, payload in entries:
+            keyword = keyword.lower()
+            positions.setdefault(keyword, []).append(len(payloads))
+            keywords.append(keyword)
+            payloads.append(payload)
+
+        self.keywords: Tuple[str, ...] = tuple(keywords)
+        self.payloads: Tuple[Any, ...] = tuple(payloads)
+        self._automaton = None
+        self._first_entries: Tuple[Tuple[str, int], ...] = ()
+        self._prefix_groups: Tuple[Tuple[Optional[str], Tuple[Tuple[str, Tuple[int, ...]], ...]], ...] = ()
+
+        if AHOCORASICK_AVAILABLE and positions:
+            self._automaton = ahocorasick.Automaton()
+            for keyword, indices in positions.items():
+                self._automaton.add_word(keyword, tuple(indices))
+            self._automaton.make_automaton()
+        else:
+            prefix_groups: Dict[str, List[Tuple[str, Tuple[int, ...]]]] = {}
+            for keyword, indices in positions.items():
+                prefix = keyword[:self.PREFIX_LENGTH]
+                prefix_groups.setdefault(prefix, []).append((keyword, tuple(indices)))
+            # A lone keyword is checked directly: testing its prefix first would only add a scan
+            self._prefix_groups = tuple(
+                (prefix if len(group) > 1 else None, tuple(group))
+                for prefix, group in prefix_groups.items()
+            )
+            # Distinct keywords with their first entry; positions is already in registration order
+            self._first_entries = tuple((keyword, indices[0]) for keyword, indices in positions.items())
+
+    def find(self, *texts: str) -> List[Any]:
+        """Return payloads of all keywords found in any of the lower-cased texts"""
+        matched = set()
+
+        if self._automaton is not None:
+            for text in texts:
+                if text:
+                    for _, indices in self._automaton.iter(text):
+                        matched.update(indices)
+        else:
+            for text in texts:
+                if not text:
+                    continue
+                for prefix, group in self._prefix_groups:
+                    if prefix is None or prefix in text:
+                        for keyword, indices in group:
+                            if keyword in text:
+                                matched.update(indices)
+
+        return [self.payloads[i] for i in sorted(matched)]
+
+    def find_first(self, *texts: str, default: Any = None) -> Any:
+        """Return the payload of the earliest registered keyword found in any text
+
+        Equivalent to ``find(*texts)[0]`` (or ``default`` when nothing matches),
+        but stops as soon as the answer is known instead of collecting every match.
+        """
+        if self._automaton is not None:
+            first = None
+            for text in texts:
+                if text:
+                    for _, indices in self._automaton.iter(text):
+                        if first is None or indices[0] < first:
+                            first = indices[0]
+                            if first == 0:
+                                return self.payloads[0]
+            return default if first is None else self.payloads[first]
+
+        texts = [text for text in texts if text]
+        for keyword, index in self._first_entries:
+            for text in texts:
+                if keyword in text:
+                    return self.payloads[index]
+        return default
+
+
+# Matchers built by shared_matcher, keyed by their entries
+_shared_matchers: Dict[Tuple[Tuple[str, Any], ...], KeywordMatcher] = {}
+
+
+def shared_matcher(entries: Iterable[Tuple[str, Any]]) -> KeywordMatcher:
+    """Return a KeywordMatcher for the entries, reusing one built earlier in this process
+
+    Matchers are immutable once built, so analyzers constructed repeatedly with the
+    same keyword tables can share one. Payloads must be hashable.
+    """
+    key = tuple(entries)
+    matcher = _shared_matchers.get(key)
+    if matcher is None:
+        matcher = _shared_matchers[key] = KeywordMatcher(key)
+    return matcher